@@ -0,0 +1,246 @@
+import argparse
+import copy
+import json
+import platform
+import sys
+import time
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+import logic
+import mediator
+
+DEFAULT_SIZES: tuple[int, ...] = (50, 200, 1000, 5000)
+DEFAULT_SEARCH_SIZES: tuple[int, ...] = (50, 200, 1000)
+
+
+def random_points(n: int, seed: int) -> list[logic.Point]:
+    """
+    Облако случайных точек в квадрате [0, 1000) x [0, 1000).
+
+    :param n: Количество точек
+    :param seed: Начальное значение генератора
+    :return: Список точек
+    """
+    coordinates: np.ndarray = np.random.default_rng(seed).random((n, 2)) * 1000
+    return [logic.Point(x, y) for x, y in coordinates.tolist()]
+
+
+def random_triangles(points: list[logic.Point], count: int, seed: int) -> list[logic.Triangle]:
+    """
+    Набор невырожденных треугольников со случайными вершинами из облака точек.
+
+    :param points: Облако точек
+    :param count: Количество треугольников
+    :param seed: Начальное значение генератора
+    :return: Список треугольников
+    """
+    rng: np.random.Generator = np.random.default_rng(seed)
+    triangles: list[logic.Triangle] = []
+    while len(triangles) < count:
+        p1, p2, p3 = (points[i] for i in rng.choice(len(points), 3, replace=False).tolist())
+        try:
+            triangles.append(logic.Triangle(logic.Edge(p1, p2), logic.Edge(p1, p3), logic.Edge(p2, p3)))
+        except ValueError:
+            continue
+    return triangles
+
+
+def regular_polygon(n: int) -> tuple[logic.Edge, ...]:
+    """
+    Ребра правильного n-угольника.
+
+    :param n: Количество вершин
+    :return: Кортеж ребер
+    """
+    angles: np.ndarray = 2 * np.pi * np.arange(n) / n
+    points: list[logic.Point] = [logic.Point(500 + 400 * np.cos(angle), 500 + 400 * np.sin(angle)) for angle in angles]
+    return tuple(logic.Edge(points[i], points[(i + 1) % n]) for i in range(n))
+
+
+def measure(run: Callable[[], Any], repeat: int, setup: Optional[Callable[[], Any]] = None) -> float:
+    """
+    Минимальное по нескольким запускам время выполнения функции.
+
+    :param run: Измеряемая функция
+    :param repeat: Количество запусков
+    :param setup: Функция, выполняемая перед каждым запуском вне замера
+    :return: Время в секундах
+    """
+    best: float = float("inf")
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start: float = time.perf_counter()
+        run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_triangles(n: int, seed: int, repeat: int) -> dict[str, float]:
+    """
+    Замер операций над треугольниками, построенными на облаке из n точек. Перед каждым запуском запомненные
+    характеристики очищаются, поэтому измеряется вычисление, а не чтение из кэша. Отдельно замеряется повторное
+    чтение площади, которая уже запомнена.
+
+    :param n: Количество точек и треугольников
+    :param seed: Начальное значение генератора
+    :param repeat: Количество запусков
+    :return: Время одной операции в секундах для каждого замера
+    """
+    points: list[logic.Point] = random_points(n, seed)
+    triangles: list[logic.Triangle] = random_triangles(points, n, seed + 1)
+    vertices: list[tuple[logic.Point, ...]] = [triangle._vertices() for triangle in triangles]
+    systems: list[tuple[tuple[tuple[float, float], ...], tuple[float, float]]] = []
+    for p1, p2, p3 in vertices:
+        bx, by, cx, cy = p2.x - p1.x, p2.y - p1.y, p3.x - p1.x, p3.y - p1.y
+        systems.append((((2 * bx, 2 * by), (2 * cx, 2 * cy)), (bx * bx + by * by, cx * cx + cy * cy)))
+
+    def clear() -> None:
+        for triangle in triangles:
+            triangle.clear_metrics()
+
+    res: dict[str, float] = {
+        "triangle_init": measure(lambda: [logic.Triangle(logic.Edge(p1, p2), logic.Edge(p1, p3), logic.Edge(p2, p3))
+                                          for p1, p2, p3 in vertices], repeat),
+        "triangle_square": measure(lambda: [triangle.square() for triangle in triangles], repeat, clear),
+        "triangle_square_cached": measure(lambda: [triangle.square() for triangle in triangles], repeat),
+        "triangle_circumcircle_center": measure(lambda: [triangle.circumcircle_center() for triangle in triangles],
+                                                repeat),
+        "triangle_solve": measure(lambda: [logic.Triangle._solve(matrix, values) for matrix, values in systems],
+                                  repeat),
+        "triangle_circumcircle": measure(lambda: [triangle.circumcircle() for triangle in triangles], repeat, clear),
+        "triangle_deepcopy": measure(lambda: [copy.deepcopy(triangle) for triangle in triangles], repeat),
+    }
+    return {name: value / len(triangles) for name, value in res.items()}
+
+
+def bench_polygon(n: int, repeat: int) -> dict[str, float]:
+    """
+    Замер построения правильного n-угольника, включая проверку ребер.
+
+    :param n: Количество вершин
+    :param repeat: Количество запусков
+    :return: Время построения в секундах
+    """
+    edges: tuple[logic.Edge, ...] = regular_polygon(n)
+    return {"polygon_init": measure(lambda: logic.Polygon(edges), repeat)}
+
+
+def bench_search(n: int, seed: int, repeat: int, workers: int) -> dict[str, float]:
+    """
+    Замер поиска треугольника с максимальной разностью площадей на облаке из n точек. Каждый запуск выполняется на
+    новой сцене, поэтому сохраненный результат предыдущего поиска не используется.
+
+    :param n: Количество точек
+    :param seed: Начальное значение генератора
+    :param repeat: Количество запусков
+    :param workers: Количество процессов поиска
+    :return: Время поиска в секундах
+    """
+    coordinates: np.ndarray = np.random.default_rng(seed).random((n, 2)) * 1000
+    scene_objects: list[mediator.SceneObjects] = []
+
+    def setup() -> None:
+        scene_objects.clear()
+        scene_objects.append(mediator.SceneObjects(workers))
+        scene_objects[0].add_points(coordinates[:, 0], coordinates[:, 1])
+
+    return {"find_selected_triangle": measure(lambda: scene_objects[0].find_selected_triangle(), repeat, setup)}
+
+
+def run_benchmarks(sizes: tuple[int, ...], search_sizes: tuple[int, ...], seed: int, repeat: int,
+                   workers: int) -> dict[str, Any]:
+    """
+    Выполнение всех замеров.
+
+    :param sizes: Размеры облаков точек для операций над треугольниками и многоугольниками
+    :param search_sizes: Размеры облаков точек для поиска треугольника
+    :param seed: Начальное значение генератора
+    :param repeat: Количество запусков каждого замера
+    :param workers: Количество процессов поиска
+    :return: Словарь вида {"meta": параметры запуска, "results": {замер: {n: время в секундах}}, "metrics":
+    счетчики обращений к запомненным характеристикам}
+    """
+    logic.metrics_stats.clear()
+    results: dict[str, dict[str, float]] = {}
+    for n in sizes:
+        for name, value in {**bench_triangles(n, seed, repeat), **bench_polygon(n, repeat)}.items():
+            results.setdefault(name, {})[str(n)] = value
+    for n in search_sizes:
+        for name, value in bench_search(n, seed, repeat, workers).items():
+            results.setdefault(name, {})[str(n)] = value
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+            "seed": seed,
+            "repeat": repeat,
+            "workers": workers,
+        },
+        "results": results,
+        "metrics": {"hits": logic.metrics_stats.hits, "misses": logic.metrics_stats.misses},
+    }
+
+
+def compare(current: dict[str, Any], baseline: dict[str, Any], threshold: float) -> list[tuple[str, str, float]]:
+    """
+    Сравнение результатов с базовыми. Печатает таблицу отношений времени и возвращает замедлившиеся замеры.
+
+    :param current: Текущие результаты
+    :param baseline: Базовые результаты
+    :param threshold: Допустимое относительное замедление
+    :return: Список замедлений вида (замер, n, отношение нового времени к базовому)
+    """
+    regressions: list[tuple[str, str, float]] = []
+    for name, values in current["results"].items():
+        for n, value in values.items():
+            base: Optional[float] = baseline["results"].get(name, {}).get(n)
+            if base is None:
+                continue
+            ratio: float = value / base if base > 0 else float("inf")
+            mark: str = ""
+            if ratio > 1 + threshold:
+                regressions.append((name, n, ratio))
+                mark = " !"
+            print(f"{name:<30} {n:>6} {base:12.3e} {value:12.3e} {ratio:8.2f}x{mark}", file=sys.stderr)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Замер производительности геометрии и поиска треугольника")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="Размеры облаков точек для операций над треугольниками и многоугольниками")
+    parser.add_argument("--search-sizes", type=int, nargs="*", default=DEFAULT_SEARCH_SIZES,
+                        help="Размеры облаков точек для поиска треугольника. Поиск перебирает все тройки точек, "
+                             "поэтому n = 5000 занимает десятки минут")
+    parser.add_argument("--seed", type=int, default=0, help="Начальное значение генератора")
+    parser.add_argument("--repeat", type=int, default=3, help="Количество запусков каждого замера")
+    parser.add_argument("--workers", type=int, default=1, help="Количество процессов поиска")
+    parser.add_argument("-o", "--output", help="Файл для записи результатов, по умолчанию стандартный вывод")
+    parser.add_argument("--baseline", help="Файл с базовыми результатами для сравнения")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="Допустимое относительное замедление при сравнении с базовыми результатами")
+    args = parser.parse_args()
+    res: dict[str, Any] = run_benchmarks(tuple(args.sizes), tuple(args.search_sizes), args.seed, args.repeat,
+                                         args.workers)
+    text: str = json.dumps(res, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline: dict[str, Any] = json.load(file)
+        regressions: list[tuple[str, str, float]] = compare(res, baseline, args.threshold)
+        for name, n, ratio in regressions:
+            print(f"Замедление: {name}, n = {n}: {ratio:.2f}x", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
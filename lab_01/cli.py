@@ -0,0 +1,128 @@
+import argparse
+import cProfile
+import json
+import pstats
+import sys
+import time
+from typing import Any, Optional
+
+import mediator
+
+
+def load(path: str, workers: int = 1, use_threads: bool = False) -> tuple[mediator.SceneObjects, float]:
+    """
+    Загрузка точек из файла.
+
+    :param path: Путь к файлу с точками
+    :param workers: Количество потоков или процессов поиска
+    :param use_threads: Использовать потоки вместо процессов
+    :return: Объекты сцены с загруженными точками и время загрузки в секундах
+    :raises ValueError: Если файл не содержит пар координат
+    """
+    scene_objects: mediator.SceneObjects = mediator.SceneObjects(workers, use_threads)
+    start: float = time.perf_counter()
+    scene_objects.load_points(path)
+    return scene_objects, time.perf_counter() - start
+
+
+def search(scene_objects: mediator.SceneObjects, load_time: float = 0.0) -> dict[str, Any]:
+    """
+    Поиск треугольника с максимальной разностью площадей описанной окружности и самого треугольника.
+
+    :param scene_objects: Объекты сцены с загруженными точками
+    :param load_time: Время загрузки точек в секундах
+    :return: Словарь с результатом, пригодный для записи в JSON
+    """
+    loaded: float = time.perf_counter()
+    best: list[tuple[tuple[int, int, int], float]] = scene_objects.find_selected_triangles(1)
+    found: float = time.perf_counter()
+    res: dict[str, Any] = {
+        "points": scene_objects.points_num(),
+        "triangle": None,
+    }
+    timing: dict[str, float] = {"load": load_time, "search": found - loaded}
+    if not best:
+        res["timing"] = timing
+        return res
+    points_id, _ = best[0]
+    triangle_id: int = scene_objects.add_triangle(points_id)
+    try:
+        circle_id: int = scene_objects.add_circumcircle(triangle_id)
+    except ValueError:
+        # Вырожденный треугольник не имеет описанной окружности
+        scene_objects.remove_polygon(triangle_id)
+        res["timing"] = timing
+        return res
+    triangle_square: float = scene_objects.polygon_square(triangle_id)
+    circle_square: float = scene_objects.circle_square(circle_id)
+    res["triangle"] = {
+        "points": [{"id": point_id, "x": x, "y": y}
+                   for point_id, (x, y) in zip(points_id, map(scene_objects.get_point_pos, points_id))],
+        "square": triangle_square,
+    }
+    res["circumcircle"] = {
+        "center": list(scene_objects.circle_center(circle_id)),
+        "radius": scene_objects.circle_radius(circle_id),
+        "square": circle_square,
+    }
+    res["difference"] = circle_square - triangle_square
+    res["timing"] = timing
+    return res
+
+
+def run(path: str, workers: int = 1, use_threads: bool = False) -> dict[str, Any]:
+    """
+    Загрузка точек из файла и поиск треугольника с максимальной разностью площадей описанной окружности и самого
+    треугольника.
+
+    :param path: Путь к файлу с точками
+    :param workers: Количество потоков или процессов поиска
+    :param use_threads: Использовать потоки вместо процессов
+    :return: Словарь с результатом, пригодный для записи в JSON
+    :raises ValueError: Если файл не содержит пар координат
+    """
+    return search(*load(path, workers, use_threads))
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        description="Поиск треугольника с максимальной разностью площадей описанной окружности и самого треугольника "
+                    "без графического интерфейса")
+    parser.add_argument("path", help="Файл с точками: .csv, .txt, .npy или двоичный файл из пар float64")
+    parser.add_argument("-o", "--output", help="Файл для записи результата, по умолчанию стандартный вывод")
+    workers = parser.add_mutually_exclusive_group()
+    workers.add_argument("--threads", type=int, default=0, help="Количество потоков поиска")
+    workers.add_argument("--procs", type=int, default=0, help="Количество процессов поиска")
+    parser.add_argument("--profile", action="store_true",
+                        help="Профилировать поиск и вывести статистику в стандартный поток ошибок")
+    args = parser.parse_args(argv)
+    if args.threads < 0 or args.procs < 0:
+        parser.error("количество потоков и процессов должно быть неотрицательным")
+    profiler: Optional[cProfile.Profile] = cProfile.Profile() if args.profile else None
+    start: float = time.perf_counter()
+    try:
+        if profiler is not None:
+            profiler.enable()
+        try:
+            scene_objects, load_time = load(args.path, max(args.threads, args.procs, 1), args.threads > 0)
+        except (ValueError, OSError) as e:
+            print(f"Ошибка при загрузке точек: {str(e) or 'файл не содержит координат точек'}", file=sys.stderr)
+            return 1
+        res: dict[str, Any] = search(scene_objects, load_time)
+    finally:
+        if profiler is not None:
+            profiler.disable()
+    res["timing"]["total"] = time.perf_counter() - start
+    if profiler is not None:
+        pstats.Stats(profiler, stream=sys.stderr).sort_stats("cumulative").print_stats(25)
+    text: str = json.dumps(res, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            file.write(text + "\n")
+    else:
+        print(text)
+    return 0 if res["triangle"] is not None else 2
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -7,21 +7,34 @@
 from typing import TypeVar, Type, Optional
 
 from PyQt6 import QtCore, QtWidgets
-from PyQt6.QtCore import Qt, QLineF, QRectF
-from PyQt6.QtGui import QColor, QFont
-from PyQt6.QtWidgets import QMessageBox, QTableWidgetItem
+from PyQt6.QtCore import QRectF
+from PyQt6.QtGui import QColor, QFont, QPainterPath, QPen
+from PyQt6.QtWidgets import QMessageBox
 
 from mediator import SceneObjects
+from points_model import PointsTableModel
 
 
 # TODO: Заменить в надписи о вершинах треугольника ограничение 3-мя знаками после запятой
 
+class ClickableScene(QtWidgets.QGraphicsScene):
+    """
+    Сцена, сообщающая о нажатиях мыши координатами точки сцены.
+    """
+    clicked = QtCore.pyqtSignal(float, float)
+
+    def mousePressEvent(self, event):
+        position = event.scenePos()
+        self.clicked.emit(position.x(), position.y())
+        super().mousePressEvent(event)
+
+
 class Ui_MainWindow:
+    select_radius: float = 10
 
     def __init__(self, main_window, scene_objects: SceneObjects):
-        self.objects_id: list[int] = []
         self.temporary_objects_id: list[int] = []
-        self.cell_just_changed = False
+        self.view_transform: Optional[tuple[float, float, float, tuple[float, float]]] = None
         self.main_window = main_window
         self.scene_objects = scene_objects
         main_window.setObjectName("MainWindow")
@@ -30,18 +43,22 @@ class Ui_MainWindow:
         self.central_widget.setObjectName("central_widget")
         self.resultView = QtWidgets.QGraphicsView(parent=self.central_widget)
         self.resultView.setGeometry(QtCore.QRect(10, 10, 610, 610))
-        self.scene = QtWidgets.QGraphicsScene(parent=self.resultView)
+        self.scene = ClickableScene(parent=self.resultView)
         self.scene.setSceneRect(5, 5, 600, 600)
         self.resultView.setScene(self.scene)
         self.resultView.setObjectName("resultView")
+        self.create_scene_items()
         self.text_result_viewer = QtWidgets.QTextBrowser(parent=self.central_widget)
         self.text_result_viewer.setGeometry(QtCore.QRect(650, 480, 350, 250))
-        self.pointsDataView = QtWidgets.QTableWidget(0, 3, parent=self.central_widget)
-        self.pointsDataView.hideColumn(0)
+        self.points_model = PointsTableModel(scene_objects, parent=main_window)
+        self.pointsDataView = QtWidgets.QTableView(parent=self.central_widget)
+        self.pointsDataView.setModel(self.points_model)
+        self.pointsDataView.hideColumn(PointsTableModel.ID_COLUMN)
         self.pointsDataView.setGeometry(QtCore.QRect(650, 10, 350, 440))
-        self.pointsDataView.setHorizontalHeaderLabels(("Id", "x", "y"))
         self.pointsDataView.setObjectName("pointsData")
-        self.pointsDataView.cellChanged.connect(self.change_point)
+        self.points_model.point_changed.connect(self.change_point)
+        self.points_model.invalid_value.connect(self.show_invalid_value)
+        self.scene.clicked.connect(self.select_point_at)
         self.add_button = QtWidgets.QPushButton(parent=self.central_widget)
         self.add_button.setGeometry(QtCore.QRect(460, 670, 120, 31))
         self.add_button.setObjectName("add_button")
@@ -91,6 +108,9 @@ class Ui_MainWindow:
         self.clear_points_button = QtWidgets.QPushButton(parent=self.central_widget)
         self.clear_points_button.setGeometry(QtCore.QRect(120, 730, 140, 31))
         self.clear_points_button.setObjectName("clear_points_button")
+        self.load_button = QtWidgets.QPushButton(parent=self.central_widget)
+        self.load_button.setGeometry(QtCore.QRect(10, 670, 200, 31))
+        self.load_button.setObjectName("load_button")
 
         self.translate_ui()
         QtCore.QMetaObject.connectSlotsByName(main_window)
@@ -98,6 +118,7 @@ class Ui_MainWindow:
         self.remove_button.clicked.connect(self.clicked_remove_button)
         self.calc_button.clicked.connect(self.calc_res)
         self.clear_points_button.clicked.connect(self.clear_points)
+        self.load_button.clicked.connect(self.clicked_load_button)
 
     def translate_ui(self):
         _translate = QtCore.QCoreApplication.translate
@@ -108,6 +129,7 @@ class Ui_MainWindow:
         self.remove_button.setText(_translate("MainWindow", "Удалить"))
         self.clear_points_button.setText(_translate("MainWindow", "Очистить все"))
         self.calc_button.setText(_translate("MainWindow", "Рассчитать"))
+        self.load_button.setText(_translate("MainWindow", "Загрузить из файла"))
         self.xValueLabel_8.setText(_translate("MainWindow", "id"))
         self.xValueLabel_5.setText(_translate("MainWindow", "Операции над точками"))
 
@@ -129,32 +151,57 @@ class Ui_MainWindow:
         else:
             return True
 
-    def change_point(self, row: int, column: int) -> None:
+    def change_point(self, point_id: int) -> None:
         """
-        Обработчик события изменения точки.
+        Обработчик события изменения точки в таблице.
 
-        :param row: Строка, в которой произошло изменение.
-        :param column: Столбец, в котором произошло изменение.
+        :param point_id: Id измененной точки
         :return: None
         """
-        if self.cell_just_changed:
-            self.cell_just_changed = False
-            return
         self.clear_res()
-        if column == 0:
-            raise ValueError
-        item: QTableWidgetItem = self.pointsDataView.item(row, column)
-        point_id: int = int(self.pointsDataView.item(row, 0).text())
-        if not self.validate(float, item.text()):
-            self.show_error("Ошибка при изменении точки", "Некорректное значение поля")
-            old_point_coordinates: tuple[float, float] = self.scene_objects.get_point_pos(point_id)
-            self.pointsDataView.setItem(row, column, QTableWidgetItem(str(old_point_coordinates[column - 1])))
-            return
-        new_value: float = float(item.text())
-        if column == 1:
-            self.scene_objects.set_point_pos(point_id, x=new_value)
-        elif column == 2:
-            self.scene_objects.set_point_pos(point_id, y=new_value)
+
+    def show_invalid_value(self, row: int, column: int) -> None:
+        """
+        Обработчик ввода некорректного значения в таблицу. Значение в таблице не меняется.
+
+        :param row: Строка, в которой произошло изменение
+        :param column: Столбец, в котором произошло изменение
+        :return: None
+        """
+        self.show_error("Ошибка при изменении точки", "Некорректное значение поля")
+
+    def create_scene_items(self) -> None:
+        """
+        Создание постоянных элементов сцены. Результат рисуется изменением путей этих элементов, а не созданием новых
+        элементов при каждой отрисовке. Оси координат строятся один раз.
+
+        :return: None
+        """
+        self.polygon_item: QtWidgets.QGraphicsPathItem = self.scene.addPath(QPainterPath())
+        self.circle_item: QtWidgets.QGraphicsPathItem = self.scene.addPath(QPainterPath())
+        self.guides_item: QtWidgets.QGraphicsPathItem = self.scene.addPath(QPainterPath())
+        self.axes_item: QtWidgets.QGraphicsItemGroup = QtWidgets.QGraphicsItemGroup()
+        axes: QPainterPath = QPainterPath()
+        # TODO: Переписать с использованием размеров сцены
+        for x1, y1, x2, y2 in ((5, 585, 595, 585), (20, 5, 20, 600), (20, 5, 15, 8), (20, 5, 25, 8),
+                               (595, 585, 592, 580), (595, 585, 592, 590)):
+            axes.moveTo(x1, y1)
+            axes.lineTo(x2, y2)
+        self.axes_item.addToGroup(QtWidgets.QGraphicsPathItem(axes))
+        for text, position in (("x", (590, 585)), ("y", (2, 1))):
+            label: QtWidgets.QGraphicsTextItem = QtWidgets.QGraphicsTextItem(text)
+            label.setFont(QFont("Times", 9))
+            label.setPos(*position)
+            self.axes_item.addToGroup(label)
+        self.scene.addItem(self.axes_item)
+        self.coordinate_labels: list[QtWidgets.QGraphicsTextItem] = []
+        self.coordinate_labels_used: int = 0
+        self.hide_result_items()
+
+    def hide_result_items(self) -> None:
+        for item in (self.polygon_item, self.circle_item, self.guides_item, self.axes_item, *self.coordinate_labels):
+            item.setVisible(False)
+        self.coordinate_labels_used = 0
 
     def draw_polygon(self, edges: tuple[tuple[tuple[float, float], tuple[float, float]], ...], color: QColor) -> None:
         """
@@ -165,10 +212,13 @@ class Ui_MainWindow:
         :param color: Цвет
         :return: None
         """
-        for edge in edges:
-            p1 = edge[0]
-            p2 = edge[1]
-            self.scene.addLine(QLineF(*p1, *p2), color)
+        path: QPainterPath = QPainterPath()
+        for p1, p2 in edges:
+            path.moveTo(*p1)
+            path.lineTo(*p2)
+        self.polygon_item.setPath(path)
+        self.polygon_item.setPen(QPen(color))
+        self.polygon_item.setVisible(True)
 
     def draw_circle(self, render_circle: tuple[float, float, float, float], color: QColor) -> None:
         """
@@ -180,16 +230,23 @@ class Ui_MainWindow:
         :param color: Цвет
         :return: None
         """
-        self.scene.addEllipse(QRectF(*render_circle), color)
+        path: QPainterPath = QPainterPath()
+        path.addEllipse(QRectF(*render_circle))
+        self.circle_item.setPath(path)
+        self.circle_item.setPen(QPen(color))
+        self.circle_item.setVisible(True)
 
     def clear_points(self):
-        self.scene_objects.remove_all()
-        self.pointsDataView.setRowCount(0)
         self.clear_res()
-        self.objects_id.clear()
+        self.points_model.clear()
 
     def show_point_coordinates(self, point_coordinates: tuple[float, float], position: tuple[float, float]) -> None:
-        text = self.scene.addText(f"({point_coordinates[0]:.3f}, {point_coordinates[1]:.3f})")
+        if self.coordinate_labels_used == len(self.coordinate_labels):
+            self.coordinate_labels.append(self.scene.addText(""))
+        text: QtWidgets.QGraphicsTextItem = self.coordinate_labels[self.coordinate_labels_used]
+        self.coordinate_labels_used += 1
+        text.setPlainText(f"({point_coordinates[0]:.3f}, {point_coordinates[1]:.3f})")
+        text.setVisible(True)
         if position[0] + text.boundingRect().width() > 560:
             text.setPos(position[0] - text.boundingRect().width(), position[1])
         else:
@@ -201,18 +258,7 @@ class Ui_MainWindow:
 
         :return: None
         """
-        # TODO: Переписать с использованием размеров сцены
-        scene_rect: QRectF = self.scene.sceneRect()
-        self.scene.addLine(5, 585, 595, 585)
-        self.scene.addLine(20, 5, 20, 600)
-        self.scene.addLine(20, 5, 15, 8)
-        self.scene.addLine(20, 5, 25, 8)
-        self.scene.addLine(595, 585, 592, 580)
-        self.scene.addLine(595, 585, 592, 590)
-        x_label = self.scene.addText("x", QFont("Times", 9))
-        y_label = self.scene.addText("y", QFont("Times", 9))
-        x_label.setPos(590, 585)
-        y_label.setPos(2, 1)
+        self.axes_item.setVisible(True)
 
     def gen_text(self, triangle_id: int, circle_id: int) -> str:
         """
@@ -246,7 +292,12 @@ class Ui_MainWindow:
         if req_triangle_id is None:
             self.show_error("Ошибка при обработке", "Заданный треугольник не найден")
             return
-        req_circle_id: int = self.scene_objects.add_circumcircle(req_triangle_id)
+        try:
+            req_circle_id: int = self.scene_objects.add_circumcircle(req_triangle_id)
+        except ValueError:
+            self.scene_objects.remove_polygon(req_triangle_id)
+            self.show_error("Ошибка при обработке", "Найденный треугольник вырожден")
+            return
         self.temporary_objects_id.append(req_triangle_id)
         self.temporary_objects_id.append(req_circle_id)
         real_coordinates: tuple[tuple[float, float], ...] = self.scene_objects.polygon_points(req_triangle_id)
@@ -263,6 +314,7 @@ class Ui_MainWindow:
         screen_center: tuple[float, float] = self.scene.sceneRect().width() / 2, self.scene.sceneRect().height() / 2
         self.scene_objects.move_polygon(req_triangle_id, *screen_center)
         self.scene_objects.move_circle(req_circle_id, *screen_center)
+        self.view_transform = (x_offset, y_offset, scale, screen_center)
         self.draw_polygon(self.scene_objects.render_polygon(req_triangle_id), QColor("red"))
         self.draw_circle(self.scene_objects.render_circle(req_circle_id), QColor("black"))
         self.draw_axes()
@@ -278,14 +330,17 @@ class Ui_MainWindow:
                                          (rendered_triangle[2][0][1] + rendered_triangle[2][1][1]) / 2
         circle_center: tuple[float, float] = self.scene_objects.circle_center(req_circle_id)
         if abs(e1_center[0] - circle_center[0]) < 1e-6 and abs(e1_center[1] - circle_center[1]) < 1e-6:
-            self.scene.addLine(*e2_center, *circle_center)
-            self.scene.addLine(*e3_center, *circle_center)
+            guides: tuple[tuple[float, float], ...] = e2_center, e3_center
         elif abs(e2_center[0] - circle_center[0]) < 1e-6 and abs(e2_center[1] - circle_center[1]) < 1e-6:
-            self.scene.addLine(*e1_center, *circle_center)
-            self.scene.addLine(*e3_center, *circle_center)
+            guides = e1_center, e3_center
         else:
-            self.scene.addLine(*e1_center, *circle_center)
-            self.scene.addLine(*e2_center, *circle_center)
+            guides = e1_center, e2_center
+        path: QPainterPath = QPainterPath()
+        for guide in guides:
+            path.moveTo(*guide)
+            path.lineTo(*circle_center)
+        self.guides_item.setPath(path)
+        self.guides_item.setVisible(True)
 
     def clear_res(self) -> None:
         """
@@ -293,7 +348,8 @@ class Ui_MainWindow:
 
         :return: None
         """
-        self.scene.clear()
+        self.hide_result_items()
+        self.view_transform = None
         self.text_result_viewer.clear()
         for cur_id in self.temporary_objects_id:
             self.scene_objects.remove_object(cur_id)
@@ -307,19 +363,7 @@ class Ui_MainWindow:
         :param y: Координата точки
         :return: None
         """
-        # print(self.scene_objects.points_num())
-        new_point_id: int = self.scene_objects.add_point(x, y)
-        self.objects_id.append(new_point_id)
-        new_point_index: int = self.scene_objects.points_num() - 1
-        self.pointsDataView.setRowCount(new_point_index + 1)
-        self.cell_just_changed = True
-        self.pointsDataView.setItem(new_point_index, 0, QTableWidgetItem(str(new_point_id)))
-        self.cell_just_changed = True
-        self.pointsDataView.item(new_point_index, 0).setFlags(Qt.ItemFlag.ItemIsEditable)
-        self.cell_just_changed = True
-        self.pointsDataView.setItem(new_point_index, 1, QTableWidgetItem(str(x)))
-        self.cell_just_changed = True
-        self.pointsDataView.setItem(new_point_index, 2, QTableWidgetItem(str(y)))
+        self.points_model.add_point(x, y)
 
     def clicked_add_button(self) -> None:
         """
@@ -335,9 +379,53 @@ class Ui_MainWindow:
             return
         x: float = float(self.add_x_value.text())
         y: float = float(self.add_y_value.text())
+        if self.scene_objects.find_point(x, y) is not None:
+            self.show_error("Ошибка при добавлении точки", "Такая точка уже существует")
+            return
         self.add_point(x, y)
         self.clear_res()
 
+    def clicked_load_button(self) -> None:
+        """
+        Обработчик нажатия кнопки загрузки точек из файла.
+
+        :return: None
+        """
+        path, _ = QtWidgets.QFileDialog.getOpenFileName(self.main_window, "Загрузка точек", "",
+                                                        "Точки (*.csv *.txt *.npy *.bin);;Все файлы (*)")
+        if not path:
+            return
+        try:
+            self.points_model.load_points(path)
+        except (ValueError, OSError):
+            self.show_error("Ошибка при загрузке точек", "Файл не содержит координат точек")
+            return
+        self.clear_res()
+
+    def select_point_at(self, scene_x: float, scene_y: float) -> None:
+        """
+        Выбор точки, ближайшей к месту нажатия на сцене. Координаты сцены переводятся в координаты точек обратно
+        преобразованию, с которым был нарисован найденный треугольник. Выбранная точка выделяется в таблице и
+        подставляется в поле удаления.
+
+        :param scene_x: Координата нажатия на сцене
+        :param scene_y: Координата нажатия на сцене
+        :return: None
+        """
+        if self.view_transform is None:
+            return
+        x_offset, y_offset, scale, screen_center = self.view_transform
+        x: float = (scene_x - screen_center[0]) / scale - x_offset
+        y: float = (scene_y - screen_center[1]) / -scale - y_offset
+        point_id: Optional[int] = self.scene_objects.nearest_point(x, y, self.select_radius / scale)
+        if point_id is None:
+            return
+        row: int = self.points_model.row(point_id)
+        self.pointsDataView.selectRow(row)
+        self.remove_id_value.setText(str(row + 1))
+        point_x, point_y = self.scene_objects.get_point_pos(point_id)
+        self.statusbar.showMessage(f"Точка {row + 1}: ({point_x:.3f}, {point_y:.3f})")
+
     def show_error(self, title: str, message: str) -> None:
         """
         Отображение сообщения об ошибке.
@@ -355,8 +443,7 @@ class Ui_MainWindow:
         :param point_id: Id удаляемой точки
         :return: None
         """
-        if not self.scene_objects.remove_point(point_id):
-            self.show_error("Ошибка при удалении точки", "Внутренняя ошибка")
+        self.points_model.remove_point(self.points_model.row(point_id))
 
     def clicked_remove_button(self) -> None:
         """
@@ -372,9 +459,7 @@ class Ui_MainWindow:
             self.show_error("Ошибка при удалении точки", "Некорректное значение поля Id")
             return
         self.clear_res()
-        point_id: int = int(self.pointsDataView.item(point_index - 1, 0).text())
-        self.remove_point(point_id)
-        self.pointsDataView.removeRow(point_index - 1)
+        self.remove_point(self.points_model.point_id(point_index - 1))
 
     def show(self) -> None:
         """
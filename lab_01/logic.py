@@ -2,7 +2,60 @@ from __future__ import annotations
 
 import copy
 import math
-from typing import Final, Optional
+from typing import Callable, Final, Iterable, Optional
+
+import numpy as np
+
+
+def _slot_names(cls: type) -> tuple[str, ...]:
+    """
+    Имена всех слотов класса с учетом родительских классов.
+
+    :param cls: Класс
+    :return: Кортеж имен слотов
+    """
+    names: list[str] = []
+    for klass in reversed(cls.__mro__):
+        names.extend(klass.__dict__.get("__slots__", ()))
+    return tuple(names)
+
+
+def _deepcopy_slots(obj: object, memodict: Optional[dict]) -> object:
+    """
+    Глубокое копирование объекта с __slots__: копия создается без вызова __init__, затем копируется каждый слот.
+
+    :param obj: Копируемый объект
+    :param memodict: Словарь уже скопированных объектов
+    :return: Копия
+    """
+    if memodict is None:
+        memodict = {}
+    cls = obj.__class__
+    result = cls.__new__(cls)
+    memodict[id(obj)] = result
+    for name in _slot_names(cls):
+        setattr(result, name, copy.deepcopy(getattr(obj, name), memodict))
+    return result
+
+
+class MetricsStats:
+    """
+    Счетчики обращений к запомненным длинам ребер и характеристикам треугольников. Каждый объект хранит не больше
+    одного значения каждого вида, поэтому объем запомненных значений ограничен количеством объектов и отдельное
+    вытеснение не нужно; счетчики показывают, насколько часто запомненные значения используются.
+    """
+    __slots__ = ("hits", "misses")
+
+    def __init__(self):
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def clear(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+
+metrics_stats: MetricsStats = MetricsStats()
 
 
 class Point:
@@ -12,10 +65,22 @@ class Point:
     :param x: Координата точки
     :param y: Координата точки
     """
+    __slots__ = ("x", "y", "version")
+    eps: Final[float] = 1e-6
 
     def __init__(self, x: float, y: float):
         self.x = x
         self.y = y
+        self.version: int = 0
+
+    def __deepcopy__(self, memodict=None):
+        result = Point.__new__(Point)
+        result.x = self.x
+        result.y = self.y
+        result.version = self.version
+        if memodict is not None:
+            memodict[id(self)] = result
+        return result
 
     def set_pos(self, x: Optional[float], y: Optional[float]):
         if x is None:
@@ -25,6 +90,7 @@ class Point:
         else:
             self.x = x
             self.y = y
+        self.version += 1
 
     def get_pos(self) -> tuple[float, float]:
         return self.x, self.y
@@ -36,19 +102,7 @@ class Point:
         :param other: Вторая точка, с которой происходит сравнение
         :return: Результат сравнения
         """
-
-        def is_equal(a: float, b: float) -> bool:
-            """
-            Сравнение двух вещественных чисел. Два вещественных числа равны, если они различаются меньше чем на 1e-6.
-
-            :param a: Первое число
-            :param b: Второе число
-            :return: Результат сравнения
-            """
-            eps: Final[float] = 1e-6
-            return abs(a - b) < eps
-
-        return is_equal(self.x, other.x) and is_equal(self.y, other.y)
+        return abs(self.x - other.x) < Point.eps and abs(self.y - other.y) < Point.eps
 
     def __repr__(self):
         return f"{self.x, self.y}"
@@ -77,6 +131,19 @@ class Point:
         """
         self.x += x_offset
         self.y += y_offset
+        self.version += 1
+
+    def scale(self, scale_x: float, scale_y: float) -> None:
+        """
+        Масштабирование точки относительно начала координат.
+
+        :param scale_x: Коэффициент масштабирования по x
+        :param scale_y: Коэффициент масштабирования по y
+        :return: None
+        """
+        self.x *= scale_x
+        self.y *= scale_y
+        self.version += 1
 
 
 class Vector:
@@ -86,6 +153,7 @@ class Vector:
     :param x: Координата конца
     :param y: Координата конца
     """
+    __slots__ = ("x", "y")
 
     def __init__(self, x: float, y: float):
         self.x = x
@@ -96,12 +164,31 @@ class Vector:
 
 
 class Edge:
+    """
+    Ребро. Длина ребра запоминается вместе с версиями концов и пересчитывается только после их перемещения.
+
+    :param p1: Начало ребра
+    :param p2: Конец ребра
+    :raises ValueError: Если концы ребра совпадают
+    """
+    __slots__ = ("p1", "p2", "_length")
 
     def __init__(self, p1: Point, p2: Point):
         if p1 == p2:
             raise ValueError
         self.p1 = p1
         self.p2 = p2
+        self._length: Optional[tuple[int, int, float]] = None
+
+    def __deepcopy__(self, memodict=None):
+        if memodict is None:
+            memodict = {}
+        result = Edge.__new__(Edge)
+        memodict[id(self)] = result
+        result.p1 = copy.deepcopy(self.p1, memodict)
+        result.p2 = copy.deepcopy(self.p2, memodict)
+        result._length = self._length
+        return result
 
     def __eq__(self, other):
         return self.p1 == other.p1 and self.p2 == other.p2
@@ -119,7 +206,19 @@ class Edge:
         return Vector(self.p1.x - self.p2.x, self.p1.y - self.p2.y)
 
     def length(self) -> float:
-        return ((self.p1.x - self.p2.x) ** 2 + (self.p1.y - self.p2.y) ** 2) ** 0.5
+        p1: Point = self.p1
+        p2: Point = self.p2
+        memo: Optional[tuple[int, int, float]] = self._length
+        if memo is not None and memo[0] == p1.version and memo[1] == p2.version:
+            metrics_stats.hits += 1
+            return memo[2]
+        metrics_stats.misses += 1
+        length: float = ((p1.x - p2.x) ** 2 + (p1.y - p2.y) ** 2) ** 0.5
+        self._length = (p1.version, p2.version, length)
+        return length
+
+    def clear_metrics(self) -> None:
+        self._length = None
 
     def render(self) -> tuple[tuple[float, float], tuple[float, float]]:
         return self.p1.render(), self.p2.render()
@@ -130,14 +229,50 @@ class Edge:
 
 
 class Polygon:
+    """
+    Многоугольник. При создании проверяется, что смежные ребра не лежат на одной прямой.
+
+    :param edges: Ребра многоугольника
+    :param trusted: Пропустить проверку ребер. Используется, когда ребра построены из уже проверенных точек
+    :raises ValueError: Если смежные ребра лежат на одной прямой
+    """
+    __slots__ = ("edges", "points")
 
     @staticmethod
     def is_point_on_the_same_line(x, y, e1):
         return (e1.p2.y - e1.p1.y) * (x - e1.p1.x) == (e1.p2.x - e1.p1.x) * (y - e1.p1.y)
 
-    def __init__(self, edges: tuple[Edge, ...]):
-        for i in range(len(edges) - 1):
-            for k in range(i + 1, len(edges)):
+    _small_size: Final[int] = 8
+
+    @classmethod
+    def _adjacent_edges(cls, edges: tuple[Edge, ...]) -> Iterable[tuple[int, int]]:
+        """
+        Поиск пар ребер, у которых может быть общая вершина. Концы ребер раскладываются по сетке с шагом Point.eps,
+        поэтому равные точки лежат в одной или в соседних ячейках, и поиск занимает O(E) вместо перебора всех пар.
+        Для многоугольников из нескольких ребер перебор всех пар дешевле построения сетки.
+
+        :param edges: Ребра
+        :return: Пары индексов ребер (i, k), i < k
+        """
+        if len(edges) <= cls._small_size:
+            return [(i, k) for i in range(len(edges) - 1) for k in range(i + 1, len(edges))]
+        cells: dict[tuple[int, int], list[int]] = {}
+        for i, edge in enumerate(edges):
+            for p in (edge.p1, edge.p2):
+                cells.setdefault((math.floor(p.x / Point.eps), math.floor(p.y / Point.eps)), []).append(i)
+        pairs: set[tuple[int, int]] = set()
+        for (cell_x, cell_y), indices in cells.items():
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    for k in cells.get((cell_x + dx, cell_y + dy), ()):
+                        for i in indices:
+                            if i < k:
+                                pairs.add((i, k))
+        return pairs
+
+    def __init__(self, edges: tuple[Edge, ...], trusted: bool = False):
+        if not trusted:
+            for i, k in self._adjacent_edges(edges):
                 e1: Edge = edges[i]
                 e2: Edge = edges[k]
                 if e1.p1 == e2.p1:
@@ -164,15 +299,8 @@ class Polygon:
     def get_points(self) -> tuple[tuple[float, float], ...]:
         return tuple(el.render() for el in self.points)
 
-    def __deepcopy__(self, memodict):
-        if memodict is None:
-            memodict = dict()
-        cls = self.__class__
-        result = cls.__new__(cls)
-        memodict[id(self)] = result
-        for k, v in self.__dict__.items():
-            setattr(result, k, copy.deepcopy(v, memodict))
-        return result
+    def __deepcopy__(self, memodict=None):
+        return _deepcopy_slots(self, memodict)
 
     def move(self, x_offset: float, y_offset: float):
         for p in self.points:
@@ -180,8 +308,7 @@ class Polygon:
 
     def scale(self, scale_x: float, scale_y: float):
         for p in self.points:
-            p.x *= scale_x
-            p.y *= scale_y
+            p.scale(scale_x, scale_y)
 
     def square(self) -> float:
         return 0
@@ -197,70 +324,189 @@ class Polygon:
 
 
 class Triangle(Polygon):
+    """
+    Треугольник. Площадь и характеристики описанной окружности запоминаются вместе с версиями концов ребер и
+    пересчитываются только после перемещения вершин.
+
+    :param e1: Ребро треугольника
+    :param e2: Ребро треугольника
+    :param e3: Ребро треугольника
+    :param trusted: Пропустить проверку ребер
+    :raises ValueError: Если смежные ребра лежат на одной прямой или треугольник почти вырожден (см. is_flat)
+    """
+    __slots__ = ("_metrics_versions", "_metrics")
+
+    def __init__(self, e1: Edge, e2: Edge, e3: Edge, trusted: bool = False):
+        super().__init__((e1, e2, e3), trusted)
+        self._metrics_versions: Optional[tuple[int, ...]] = None
+        self._metrics: dict[str, float] = {}
+        if not trusted and self.is_flat(*self._sides()):
+            raise ValueError
 
-    def __init__(self, e1: Edge, e2: Edge, e3: Edge):
-        super().__init__((e1, e2, e3))
+    def _memoized(self, kind: str, compute: Callable[[], float]) -> float:
+        """
+        Получение запомненной величины или ее вычисление.
 
-    def square(self) -> float:
-        semiperimeter: float = 0
-        for edge in self.edges:
-            semiperimeter += edge.length() / 2
-        square: float = 1
+        :param kind: Вид величины
+        :param compute: Функция вычисления величины
+        :return: Значение величины
+        """
+        e1, e2, e3 = self.edges
+        versions: tuple[int, ...] = (e1.p1.version, e1.p2.version, e2.p1.version, e2.p2.version, e3.p1.version,
+                                     e3.p2.version)
+        if versions != self._metrics_versions:
+            self._metrics_versions = versions
+            self._metrics = {}
+        value: Optional[float] = self._metrics.get(kind)
+        if value is None:
+            metrics_stats.misses += 1
+            value = compute()
+            self._metrics[kind] = value
+        else:
+            metrics_stats.hits += 1
+        return value
+
+    def clear_metrics(self) -> None:
+        self._metrics_versions = None
+        self._metrics = {}
         for edge in self.edges:
-            square *= semiperimeter - edge.length()
-        return (square * semiperimeter) ** 0.5
+            edge.clear_metrics()
+
+    def square(self) -> float:
+        return self._memoized("square", self._square)
+
+    def _square(self) -> float:
+        bx, by, cx, cy = self._sides()
+        return abs(bx * cy - by * cx) / 2
+
+    _singular_eps: Final[float] = 1e-12
 
     @classmethod
-    def _determinant(cls, matrix: tuple[tuple[float, ...], ...] | list[list[float]]) -> float:
-        if len(matrix) == 1:
-            return matrix[0][0]
-        split_matrix: tuple[tuple[float, ...], ...] = tuple(el[1:] for el in matrix)
-        res: float = 0
+    def is_flat(cls, bx: float, by: float, cx: float, cy: float) -> bool:
+        """
+        Проверка, что треугольник почти вырожден: удвоенная площадь не больше _singular_eps от квадрата наибольшей
+        координаты сторон. Для таких треугольников центр описанной окружности не вычисляется. Пакетный аналог -
+        batch_degenerate, он использует те же вычисления, поэтому поиск не выбирает треугольники, отвергаемые здесь.
+
+        :param bx: Координата x стороны от первой вершины ко второй
+        :param by: Координата y стороны от первой вершины ко второй
+        :param cx: Координата x стороны от первой вершины к третьей
+        :param cy: Координата y стороны от первой вершины к третьей
+        :return: Почти вырожден ли треугольник
+        """
+        scale: float = max(abs(bx), abs(by), abs(cx), abs(cy))
+        return abs(2 * (bx * cy - by * cx)) <= cls._singular_eps * (scale * scale)
+
+    @classmethod
+    def _lu_decompose(cls, matrix: tuple[tuple[float, ...], ...] | list[list[float]]
+                      ) -> tuple[list[list[float]], list[int], int]:
+        """
+        LU-разложение матрицы с частичным выбором ведущего элемента. Обе треугольные матрицы хранятся в одной:
+        под диагональю - множители L (диагональ L единичная), на диагонали и выше - U.
+
+        :param matrix: Квадратная матрица
+        :return: Разложение, перестановка строк и ее знак
+        """
+        lu: list[list[float]] = [list(row) for row in matrix]
+        size: int = len(lu)
+        permutation: list[int] = list(range(size))
         sign: int = 1
-        for i in range(len(matrix)):
-            res += matrix[i][0] * cls._determinant(split_matrix[:i] + split_matrix[i + 1:]) * sign
-            sign *= -1
+        for col in range(size):
+            pivot_row: int = max(range(col, size), key=lambda row: abs(lu[row][col]))
+            if pivot_row != col:
+                lu[col], lu[pivot_row] = lu[pivot_row], lu[col]
+                permutation[col], permutation[pivot_row] = permutation[pivot_row], permutation[col]
+                sign = -sign
+            pivot: float = lu[col][col]
+            if pivot == 0:
+                continue
+            for row in range(col + 1, size):
+                factor: float = lu[row][col] / pivot
+                lu[row][col] = factor
+                for k in range(col + 1, size):
+                    lu[row][k] -= factor * lu[col][k]
+        return lu, permutation, sign
+
+    @classmethod
+    def _determinant(cls, matrix: tuple[tuple[float, ...], ...] | list[list[float]]) -> float:
+        lu, _, sign = cls._lu_decompose(matrix)
+        res: float = sign
+        for i in range(len(lu)):
+            res *= lu[i][i]
         return res
 
     @classmethod
-    def _crammer(cls, matrix: tuple[tuple[float, ...], ...], values: tuple[float, ...]) -> tuple[float, ...]:
-        common_determinant: float = cls._determinant(matrix)
-        ans: list[float] = []
-        for i in range(len(matrix)):
-            updated_matrix: list[list[float]] = [list(el) for el in matrix]
-            for k in range(len(matrix)):
-                updated_matrix[k][i] = values[k]
-            individual_determinant: float = cls._determinant(updated_matrix)
-            ans.append(individual_determinant / common_determinant)
+    def _solve(cls, matrix: tuple[tuple[float, ...], ...] | list[list[float]],
+               values: tuple[float, ...]) -> tuple[float, ...]:
+        """
+        Решение системы линейных уравнений через LU-разложение.
+
+        :param matrix: Квадратная матрица системы
+        :param values: Столбец свободных членов
+        :return: Решение системы
+        :raises ValueError: Если матрица вырождена или близка к вырожденной
+        """
+        lu, permutation, _ = cls._lu_decompose(matrix)
+        size: int = len(lu)
+        scale: float = max((abs(el) for row in matrix for el in row), default=0.0)
+        if any(abs(lu[i][i]) <= cls._singular_eps * scale for i in range(size)):
+            raise ValueError
+        ans: list[float] = [values[i] for i in permutation]
+        for row in range(size):
+            for k in range(row):
+                ans[row] -= lu[row][k] * ans[k]
+        for row in reversed(range(size)):
+            for k in range(row + 1, size):
+                ans[row] -= lu[row][k] * ans[k]
+            ans[row] /= lu[row][row]
         return tuple(ans)
 
+    def _vertices(self) -> tuple[Point, Point, Point]:
+        e1: Edge = self.edges[0]
+        e2: Edge = self.edges[1]
+        third: Point = e2.p2 if e2.p1 == e1.p1 or e2.p1 == e1.p2 else e2.p1
+        return e1.p1, e1.p2, third
+
+    def _sides(self) -> tuple[float, float, float, float]:
+        p1, p2, p3 = self._vertices()
+        return p2.x - p1.x, p2.y - p1.y, p3.x - p1.x, p3.y - p1.y
+
     def circumcircle_center(self) -> Point:
-        e1_center: Point = self.edges[0].center()
-        e1_dir: Vector = self.edges[0].dir_vector()
-        e2_center: Point = self.edges[1].center()
-        e2_dir: Vector = self.edges[1].dir_vector()
-        normal_e1: Vector = e1_dir.normal()
-        normal_e2: Vector = e2_dir.normal()
-        matrix = ((normal_e1.x, -normal_e2.x), (normal_e1.y, -normal_e2.y))
-        values = (e2_center.x - e1_center.x, e2_center.y - e1_center.y)
-        coefs = self._crammer(matrix, values)
-        center = (e1_center.x + coefs[0] * normal_e1.x, e1_center.y + coefs[0] * normal_e1.y)
-        return Point(*center)
+        """
+        Центр описанной окружности.
+
+        :return: Центр
+        :raises ValueError: Если треугольник почти вырожден (см. is_flat)
+        """
+        p1: Point = self._vertices()[0]
+        bx, by, cx, cy = self._sides()
+        if self.is_flat(bx, by, cx, cy):
+            raise ValueError
+        determinant: float = 2 * (bx * cy - by * cx)
+        b_norm: float = bx * bx + by * by
+        c_norm: float = cx * cx + cy * cy
+        return Point(p1.x + (cy * b_norm - by * c_norm) / determinant, p1.y + (bx * c_norm - cx * b_norm) / determinant)
 
     def circumcircle_radius(self) -> float:
+        return self._memoized("circumcircle_radius", self._circumcircle_radius)
+
+    def _circumcircle_radius(self) -> float:
+        if self.is_flat(*self._sides()):
+            raise ValueError
         sides_product: float = 1
         for edge in self.edges:
             sides_product *= edge.length()
         return sides_product / self.square() / 4
 
     def circumcircle_square(self) -> float:
-        return self.circumcircle_radius() ** 2 * math.pi
+        return self._memoized("circumcircle_square", lambda: self.circumcircle_radius() ** 2 * math.pi)
 
     def circumcircle(self) -> Circle:
         return Circle(self.circumcircle_center(), self.circumcircle_radius())
 
 
 class Circle:
+    __slots__ = ("center", "radius")
 
     def __init__(self, center: Point, radius: float):
         self.center = center
@@ -273,19 +519,104 @@ class Circle:
         return self.center.x - self.radius, self.center.y - self.radius, self.radius * 2, self.radius * 2
 
     def move(self, x_offset: float, y_offset: float):
-        self.center.x += x_offset
-        self.center.y += y_offset
+        self.center.move(x_offset, y_offset)
 
     def scale(self, scale: float):
         self.radius *= scale
 
-    def __deepcopy__(self, memodict={}):
-        cls = self.__class__
-        result = cls.__new__(cls)
-        memodict[id(self)] = result
-        for k, v in self.__dict__.items():
-            setattr(result, k, copy.deepcopy(v, memodict))
-        return result
+    def __deepcopy__(self, memodict=None):
+        return _deepcopy_slots(self, memodict)
+
+
+def _batch_vertices(triangles: np.ndarray) -> tuple[np.ndarray, ...]:
+    """
+    Координаты вершин набора треугольников по отдельности: x1, y1, x2, y2, x3, y3.
+
+    :param triangles: Массив формы (N, 3, 2) с координатами вершин
+    :return: Кортеж из шести массивов формы (N,)
+    """
+    triangles = np.asarray(triangles, dtype=np.float64)
+    return tuple(triangles[:, i, j] for i in range(3) for j in range(2))
+
+
+def batch_degenerate(triangles: np.ndarray) -> np.ndarray:
+    """
+    Поиск вырожденных треугольников: тех, для которых конструктор Triangle выбросил бы ValueError (совпадающие
+    вершины или почти вырожденный треугольник, см. Triangle.is_flat).
+
+    :param triangles: Массив формы (N, 3, 2) с координатами вершин
+    :return: Булев массив формы (N,)
+    """
+    x1, y1, x2, y2, x3, y3 = _batch_vertices(triangles)
+    eps: Final[float] = 1e-6
+    bx: np.ndarray = x2 - x1
+    by: np.ndarray = y2 - y1
+    cx: np.ndarray = x3 - x1
+    cy: np.ndarray = y3 - y1
+    scale: np.ndarray = np.maximum(np.maximum(np.abs(bx), np.abs(by)), np.maximum(np.abs(cx), np.abs(cy)))
+    res: np.ndarray = np.abs(2 * (bx * cy - by * cx)) <= Triangle._singular_eps * (scale * scale)
+    for dx, dy in ((x1 - x2, y1 - y2), (x1 - x3, y1 - y3), (x2 - x3, y2 - y3)):
+        res |= (np.abs(dx) < eps) & (np.abs(dy) < eps)
+    return res
+
+
+def batch_square(triangles: np.ndarray) -> np.ndarray:
+    """
+    Площади набора треугольников. Аналог Triangle.square.
+
+    :param triangles: Массив формы (N, 3, 2) с координатами вершин
+    :return: Массив площадей формы (N,)
+    """
+    x1, y1, x2, y2, x3, y3 = _batch_vertices(triangles)
+    return np.abs((x2 - x1) * (y3 - y1) - (y2 - y1) * (x3 - x1)) / 2
+
+
+def batch_circumcircle_radius(triangles: np.ndarray) -> np.ndarray:
+    """
+    Радиусы описанных окружностей набора треугольников. Аналог Triangle.circumcircle_radius. Для вырожденных
+    треугольников радиус равен inf или nan.
+
+    :param triangles: Массив формы (N, 3, 2) с координатами вершин
+    :return: Массив радиусов формы (N,)
+    """
+    x1, y1, x2, y2, x3, y3 = _batch_vertices(triangles)
+    sides_product: np.ndarray = np.ones_like(x1)
+    for dx, dy in ((x1 - x2, y1 - y2), (x1 - x3, y1 - y3), (x2 - x3, y2 - y3)):
+        sides_product *= np.sqrt(dx * dx + dy * dy)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return sides_product / batch_square(triangles) / 4
+
+
+def batch_circumcircle_center(triangles: np.ndarray) -> np.ndarray:
+    """
+    Центры описанных окружностей набора треугольников. Аналог Triangle.circumcircle_center. Для вырожденных
+    треугольников координаты центра равны inf или nan.
+
+    :param triangles: Массив формы (N, 3, 2) с координатами вершин
+    :return: Массив центров формы (N, 2)
+    """
+    x1, y1, x2, y2, x3, y3 = _batch_vertices(triangles)
+    bx: np.ndarray = x2 - x1
+    by: np.ndarray = y2 - y1
+    cx: np.ndarray = x3 - x1
+    cy: np.ndarray = y3 - y1
+    b_norm: np.ndarray = bx * bx + by * by
+    c_norm: np.ndarray = cx * cx + cy * cy
+    with np.errstate(divide="ignore", invalid="ignore"):
+        determinant: np.ndarray = 2 * (bx * cy - by * cx)
+        return np.stack((x1 + (cy * b_norm - by * c_norm) / determinant,
+                         y1 + (bx * c_norm - cx * b_norm) / determinant), axis=1)
+
+
+def batch_circumcircle_square(triangles: np.ndarray) -> np.ndarray:
+    """
+    Площади описанных окружностей набора треугольников. Аналог Triangle.circumcircle_square.
+
+    :param triangles: Массив формы (N, 3, 2) с координатами вершин
+    :return: Массив площадей формы (N,)
+    """
+    radius: np.ndarray = batch_circumcircle_radius(triangles)
+    return radius * radius * math.pi
 
 
 def main():
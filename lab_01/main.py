@@ -1,12 +1,14 @@
 import sys
 
-from PyQt6 import QtWidgets
-from PyQt6.QtGui import QFont
-
-import interface
 import mediator
 
-if __name__ == '__main__':
+
+def main():
+    from PyQt6 import QtWidgets
+    from PyQt6.QtGui import QFont
+
+    import interface
+
     scene_objects = mediator.SceneObjects()
     app = QtWidgets.QApplication(sys.argv)
     app.setFont(QFont("Times", 15))
@@ -14,3 +16,7 @@ if __name__ == '__main__':
     ui = interface.Ui_MainWindow(window, scene_objects)
     window.show()
     app.exec()
+
+
+if __name__ == '__main__':
+    main()
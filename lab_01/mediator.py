@@ -1,35 +1,136 @@
-import copy
-from typing import Optional
+from typing import Final, Optional
 import sys
 
+import numpy as np
+
 import logic
+import parallel
+import point_loader
+import selection
+from point_store import PointStore
+from spatial_index import SpatialIndex
 
 
 class SceneObjects:
-    def __init__(self):
-        self.points: dict[int, logic.Point] = {}
+    # Относительная погрешность оценки тройки при перестановке вершин
+    _score_tolerance: Final[float] = 1e-9
+
+    def __init__(self, workers: int = 1, use_threads: bool = False):
+        self.workers = workers
+        self.use_threads = use_threads
+        self.points: PointStore = PointStore()
+        self.index: SpatialIndex = SpatialIndex()
         self.edges: dict[int, logic.Edge] = {}
         self.polygons: dict[int, logic.Polygon] = {}
         self.circles: dict[int, logic.Circle] = {}
+        self._selected: Optional[list[tuple[tuple[int, int, int], float]]] = None
+        self._selected_k: int = 0
+        self._selected_exhaustive: bool = False
 
     def add_point(self, x: float, y: float) -> int:
-        new_point = logic.Point(x, y)
-        self.points[id(new_point)] = new_point
-        return id(new_point)
+        """
+        Добавление точки.
+
+        :param x: Координата точки
+        :param y: Координата точки
+        :return: Id новой точки
+        :raises ValueError: Если такая точка уже существует
+        """
+        if self.index.find(x, y) is not None:
+            raise ValueError
+        new_point_id: int = self.points.add(x, y)
+        self.index.insert(new_point_id, x, y)
+        self._update_selected(new_point_id)
+        return new_point_id
+
+    def add_points(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """
+        Добавление набора точек за один вызов.
+
+        :param xs: Координаты x точек
+        :param ys: Координаты y точек
+        :return: Id новых точек
+        """
+        new_points_id: np.ndarray = self.points.add_many(xs, ys)
+        self.index.insert_many(new_points_id, xs, ys)
+        if len(new_points_id):
+            self._selected = None
+        return new_points_id
+
+    def read_points(self, path: str) -> np.ndarray:
+        """
+        Чтение точек из файла (.csv, .txt, .npy или двоичного файла из пар float64) без добавления на сцену. Точки с
+        нечисловыми координатами и точки, совпадающие с уже прочитанными или существующими, пропускаются.
+
+        :param path: Путь к файлу
+        :return: Массив координат новых точек формы (N, 2)
+        :raises ValueError: Если файл не содержит пар координат
+        """
+        existing: np.ndarray = np.stack((self.points.xs, self.points.ys), axis=1)
+        return point_loader.clean_points(point_loader.read_points(path), existing)
+
+    def load_points(self, path: str) -> np.ndarray:
+        """
+        Загрузка точек из файла, см. read_points.
+
+        :param path: Путь к файлу
+        :return: Id новых точек
+        :raises ValueError: Если файл не содержит пар координат
+        """
+        coordinates: np.ndarray = self.read_points(path)
+        return self.add_points(coordinates[:, 0], coordinates[:, 1])
 
     def set_point_pos(self, point_id: int, x: Optional[float] = None, y: Optional[float] = None):
-        self.points[point_id].set_pos(x, y)
+        self.points.set(point_id, x, y)
+        self.index.update(point_id, *self.points.get(point_id))
+        self._update_selected(point_id)
 
     def get_point_pos(self, point_id: int) -> tuple[float, float]:
-        return self.points[point_id].get_pos()
+        return self.points.get(point_id)
 
     def move_point(self, point_id: int, dx: float, dy: float):
-        self.points[point_id].move(dx, dy)
+        self.points.move(point_id, dx, dy)
+        self.index.update(point_id, *self.points.get(point_id))
+        self._update_selected(point_id)
 
     def remove_point(self, point_id: int) -> bool:
-        self.points.pop(point_id)
+        self.points.remove(point_id)
+        self.index.remove(point_id)
+        self._update_selected(point_id, removed=True)
         return True
 
+    def find_point(self, x: float, y: float) -> Optional[int]:
+        """
+        Поиск точки, совпадающей с заданной с точностью 1e-6.
+
+        :param x: Координата точки
+        :param y: Координата точки
+        :return: Id найденной точки или None
+        """
+        return self.index.find(x, y)
+
+    def points_in_radius(self, x: float, y: float, radius: float) -> list[int]:
+        """
+        Поиск точек, находящихся на расстоянии не больше radius от заданной.
+
+        :param x: Координата центра
+        :param y: Координата центра
+        :param radius: Радиус поиска
+        :return: Id найденных точек
+        """
+        return self.index.query_radius(x, y, radius)
+
+    def nearest_point(self, x: float, y: float, max_distance: Optional[float] = None) -> Optional[int]:
+        """
+        Поиск ближайшей точки.
+
+        :param x: Координата точки
+        :param y: Координата точки
+        :param max_distance: Максимальное расстояние до искомой точки
+        :return: Id ближайшей точки или None
+        """
+        return self.index.nearest(x, y, max_distance)
+
     def polygon_square(self, polygon_id: int) -> float:
         return self.polygons[polygon_id].square()
 
@@ -55,6 +156,8 @@ class SceneObjects:
 
     def remove_all(self):
         self.points.clear()
+        self.index.clear()
+        self._selected = None
         self.edges.clear()
         self.polygons.clear()
         self.circles.clear()
@@ -84,7 +187,7 @@ class SceneObjects:
         return len(self.points)
 
     def render_point(self, point_id: int) -> tuple[float, float]:
-        return self.points[point_id].render()
+        return self.points.get(point_id)
 
     def render_circle(self, circle_id: int) -> tuple[float, float, float, float]:
         return self.circles[circle_id].render()
@@ -105,26 +208,84 @@ class SceneObjects:
         elif object_id in self.circles:
             self.remove_circle(object_id)
 
-    def find_selected_triangle(self) -> id:
-        max_range: float = 0.0
-        selected_triangle: Optional[logic.Triangle] = None
-        points_id_list: list[int] = list(self.points.keys())
-        for i in range(len(points_id_list) - 2):
-            p1: logic.Point = self.points[points_id_list[i]]
-            for k in range(i + 1, len(points_id_list) - 1):
-                p2: logic.Point = self.points[points_id_list[k]]
-                for z in range(k + 1, len(points_id_list)):
-                    p3: logic.Point = self.points[points_id_list[z]]
-                    try:
-                        current_triangle: logic.Triangle = logic.Triangle(logic.Edge(p1, p2), logic.Edge(p1, p3),
-                                                                          logic.Edge(p2, p3))
-                    except ValueError:
-                        continue
-                    if current_triangle.circumcircle_square() - current_triangle.square() > max_range:
-                        max_range = current_triangle.circumcircle_square() - current_triangle.square()
-                        selected_triangle = current_triangle
-        if selected_triangle is None:
+    def _coordinates(self) -> tuple[np.ndarray, np.ndarray]:
+        return self.points.xs, self.points.ys
+
+    def _update_selected(self, point_id: int, removed: bool = False) -> None:
+        """
+        Обновление сохраненного результата поиска после добавления, изменения или удаления одной точки. Пересчитываются
+        только тройки, содержащие эту точку, а оставшиеся тройки переоцениваются в текущем порядке вершин, поэтому
+        оценки совпадают с полным перебором. Сохраненный результат содержит только те треугольники, которые
+        гарантированно лучше всех остальных; если таких не осталось, он сбрасывается и следующий запрос выполнит полный
+        перебор.
+
+        :param point_id: Id точки
+        :param removed: Точка была удалена
+        :return: None
+        """
+        if self._selected is None:
+            return
+        points_id_list: list[int] = self.points.ids.tolist()
+        xs, ys = self._coordinates()
+        kept: list[tuple[selection.TripleIndex, float]] = selection.score_triples(
+            xs, ys, [tuple(sorted(self.points.index(cur_id) for cur_id in ids)) for ids, _ in self._selected
+                     if point_id not in ids])
+        if removed:
+            if not self._selected_exhaustive and self._selected:
+                # Удаление переставляет точки, поэтому оценки остальных троек могли измениться в последних знаках, а
+                # порядок среди равных оценок - поменяться: тройки с оценкой, близкой к последней сохраненной,
+                # перестают быть гарантированно лучшими
+                bound: float = self._selected[-1][1] * (1 + self._score_tolerance)
+                kept = [res for res in kept if res[1] > bound]
+            merged: list[tuple[selection.TripleIndex, float]] = selection.merge_top(kept, len(kept))
+        else:
+            merged = selection.merge_top(
+                kept + selection.find_best_triangles_with(xs, ys, self.points.index(point_id), self._selected_k),
+                self._selected_k)
+            if not self._selected_exhaustive:
+                # Тройки без этой точки, не попавшие в сохраненный результат, не лучше его последнего элемента
+                last_ids, last_score = self._selected[-1]
+                threshold = selection.rank_key((tuple(sorted(self.points.index(cur_id) for cur_id in last_ids)),
+                                                last_score))
+                merged = [res for res in merged if selection.rank_key(res) >= threshold]
+            self._selected_exhaustive = self._selected_exhaustive and len(merged) < self._selected_k
+        if not merged and not self._selected_exhaustive:
+            self._selected = None
+            return
+        self._selected = [(tuple(points_id_list[i] for i in triple), score) for triple, score in merged]
+
+    def find_selected_triangles(self, k: int) -> list[tuple[tuple[int, int, int], float]]:
+        """
+        Поиск k треугольников с максимальной разностью площадей описанной окружности и самого треугольника. Результат
+        сохраняется и поддерживается при изменении точек, поэтому повторный запрос полный перебор не выполняет.
+
+        :param k: Количество искомых треугольников
+        :return: Список пар (id вершин, разность площадей), от лучшего треугольника к худшему
+        """
+        if self._selected is not None and (len(self._selected) >= k or self._selected_exhaustive):
+            return self._selected[:k]
+        points_id_list: list[int] = self.points.ids.tolist()
+        xs, ys = self._coordinates()
+        best: list[tuple[selection.TripleIndex, float]]
+        if self.workers > 1:
+            best = parallel.find_best_triangles(xs, ys, k, self.workers, use_threads=self.use_threads)
+        else:
+            best = selection.find_best_triangles(xs, ys, k)
+        self._selected = [(tuple(points_id_list[i] for i in triple), score) for triple, score in best]
+        self._selected_k = k
+        self._selected_exhaustive = len(best) < k
+        return self._selected[:k]
+
+    def add_triangle(self, point_ids: tuple[int, int, int]) -> int:
+        p1, p2, p3 = (logic.Point(*self.points.get(point_id)) for point_id in point_ids)
+        # Поиск возвращает только невырожденные тройки, поэтому повторная проверка ребер не нужна
+        new_triangle: logic.Triangle = logic.Triangle(logic.Edge(p1, p2), logic.Edge(p1, p3), logic.Edge(p2, p3),
+                                                      trusted=True)
+        self.polygons[id(new_triangle)] = new_triangle
+        return id(new_triangle)
+
+    def find_selected_triangle(self) -> Optional[int]:
+        best: list[tuple[tuple[int, int, int], float]] = self.find_selected_triangles(1)
+        if not best:
             return None
-        cp_triangle: logic.Triangle = copy.deepcopy(selected_triangle)
-        self.polygons[id(cp_triangle)] = cp_triangle
-        return id(cp_triangle)
+        return self.add_triangle(best[0][0])
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+from typing import Optional
+
+import numpy as np
+
+import selection
+from selection import PairIndex, TripleIndex
+
+
+def split_pairs(n: int, shards: int) -> list[tuple[PairIndex, PairIndex]]:
+    """
+    Разбиение пространства пар (i, k) на непрерывные диапазоны с примерно равным количеством троек в каждом.
+
+    :param n: Количество точек
+    :param shards: Желаемое количество диапазонов
+    :return: Список диапазонов вида (первая пара, пара после последней)
+    """
+    if n < 3:
+        return []
+    triples_per_i: np.ndarray = np.array([(n - 1 - i) * (n - 2 - i) // 2 for i in range(n - 2)], dtype=np.int64)
+    cumulative_i: np.ndarray = np.cumsum(triples_per_i)
+    total: int = int(cumulative_i[-1])
+    bounds: list[PairIndex] = [(0, 1)]
+    for shard in range(1, shards):
+        target: int = total * shard // shards
+        i: int = int(np.searchsorted(cumulative_i, target, side="right"))
+        if i >= n - 2:
+            break
+        remaining: int = target - int(cumulative_i[i] - triples_per_i[i])
+        cumulative_k: np.ndarray = np.cumsum(n - 1 - np.arange(i + 1, n - 1))
+        k: int = i + 1 + int(np.searchsorted(cumulative_k, remaining, side="right"))
+        if (i, k) > bounds[-1]:
+            bounds.append((i, k))
+    bounds.append((n - 2, n - 1))
+    return [(start, stop) for start, stop in zip(bounds[:-1], bounds[1:]) if start < stop]
+
+
+def _search_shard(shm_name: str, n: int, k: int, chunk_size: int, start: PairIndex,
+                  stop: PairIndex) -> list[tuple[TripleIndex, float]]:
+    """
+    Поиск k лучших треугольников в диапазоне пар (i, k). Выполняется в дочернем процессе, координаты точек читаются
+    из разделяемой памяти.
+    """
+    shm: shared_memory.SharedMemory = shared_memory.SharedMemory(name=shm_name)
+    try:
+        coordinates: np.ndarray = np.ndarray((2, n), dtype=np.float64, buffer=shm.buf)
+        res: list[tuple[TripleIndex, float]] = selection.find_best_triangles(coordinates[0], coordinates[1], k,
+                                                                             chunk_size, start, stop)
+        del coordinates
+        return res
+    finally:
+        shm.close()
+
+
+def find_best_triangles(xs: np.ndarray, ys: np.ndarray, k: int, workers: int,
+                        chunk_size: int = selection.DEFAULT_CHUNK_SIZE,
+                        use_threads: bool = False) -> list[tuple[TripleIndex, float]]:
+    """
+    Параллельный вариант selection.find_best_triangles. Пространство пар (i, k) делится между процессами, каждый
+    процесс находит k лучших треугольников в своем диапазоне, после чего результаты объединяются. Результат
+    совпадает с последовательным поиском, в том числе при равных оценках.
+
+    :param xs: Координаты x точек
+    :param ys: Координаты y точек
+    :param k: Количество искомых треугольников
+    :param workers: Количество процессов
+    :param chunk_size: Примерное максимальное количество троек, обрабатываемых процессом за один раз
+    :param use_threads: Использовать потоки вместо процессов. Потоки работают с массивами координат напрямую, без
+        разделяемой памяти и запуска интерпретаторов, и выигрывают за счет того, что NumPy отпускает GIL
+    :return: Список из не более чем k пар (индексы вершин, оценка), от лучшего треугольника к худшему
+    """
+    n: int = len(xs)
+    shards: list[tuple[PairIndex, PairIndex]] = split_pairs(n, workers)
+    if workers <= 1 or len(shards) <= 1:
+        return selection.find_best_triangles(xs, ys, k, chunk_size)
+    if use_threads:
+        with ThreadPoolExecutor(max_workers=min(workers, len(shards))) as executor:
+            results = list(executor.map(lambda shard: selection.find_best_triangles(xs, ys, k, chunk_size, *shard),
+                                        shards))
+        return selection.merge_top((res for shard_results in results for res in shard_results), k)
+    shm: shared_memory.SharedMemory = shared_memory.SharedMemory(create=True, size=2 * n * 8)
+    try:
+        coordinates: np.ndarray = np.ndarray((2, n), dtype=np.float64, buffer=shm.buf)
+        coordinates[0] = xs
+        coordinates[1] = ys
+        del coordinates
+        with ProcessPoolExecutor(max_workers=min(workers, len(shards))) as executor:
+            results = list(executor.map(_search_shard, *zip(*((shm.name, n, k, chunk_size, start, stop)
+                                                              for start, stop in shards))))
+    finally:
+        shm.close()
+        shm.unlink()
+    return selection.merge_top((res for shard_results in results for res in shard_results), k)
+
+
+def find_best_triangle(xs: np.ndarray, ys: np.ndarray, workers: int,
+                       chunk_size: int = selection.DEFAULT_CHUNK_SIZE,
+                       use_threads: bool = False) -> Optional[tuple[TripleIndex, float]]:
+    """
+    Параллельный вариант selection.find_best_triangle.
+
+    :param xs: Координаты x точек
+    :param ys: Координаты y точек
+    :param workers: Количество процессов
+    :param chunk_size: Примерное максимальное количество троек, обрабатываемых процессом за один раз
+    :param use_threads: Использовать потоки вместо процессов
+    :return: Индексы вершин найденного треугольника и его оценка или None, если треугольник не найден
+    """
+    best: list[tuple[TripleIndex, float]] = find_best_triangles(xs, ys, 1, workers, chunk_size, use_threads)
+    return best[0] if best else None
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import os
+from typing import Final, Optional
+
+import numpy as np
+
+EPS: Final[float] = 1e-6
+# Наибольший по модулю номер ячейки сетки. Ячейки хранятся в int64, а соседние числа double с модулем не меньше
+# _CELL_LIMIT * eps различаются больше чем на eps
+_CELL_LIMIT: Final[float] = 2.0 ** 60
+
+
+def read_points(path: str) -> np.ndarray:
+    """
+    Чтение точек из файла. Поддерживаются текстовые файлы (.csv, .txt) с двумя столбцами, файлы NumPy (.npy),
+    которые отображаются в память без чтения целиком, и двоичные файлы из пар float64 (любое другое расширение).
+
+    :param path: Путь к файлу
+    :return: Массив координат формы (N, 2)
+    :raises ValueError: Если файл не содержит пар координат
+    """
+    extension: str = os.path.splitext(path)[1].lower()
+    if extension in (".csv", ".txt"):
+        with open(path, encoding="utf-8") as file:
+            sample: str = file.read(4096)
+        if not sample.strip():
+            return np.empty((0, 2), dtype=np.float64)
+        delimiter: Optional[str] = ";" if ";" in sample else "," if "," in sample else None
+        skip_header: int = 0 if _is_number_row(sample.lstrip().splitlines()[0], delimiter) else 1
+        try:
+            coordinates: np.ndarray = np.genfromtxt(path, delimiter=delimiter, skip_header=skip_header,
+                                                    dtype=np.float64, ndmin=2, usecols=(0, 1))
+        except IndexError:
+            raise ValueError
+    elif extension == ".npy":
+        coordinates = np.load(path, mmap_mode="r")
+    else:
+        coordinates = np.memmap(path, dtype=np.float64, mode="r")
+        if len(coordinates) % 2:
+            raise ValueError
+        coordinates = coordinates.reshape(-1, 2)
+    if coordinates.ndim != 2 or coordinates.shape[1] != 2:
+        raise ValueError
+    return coordinates
+
+
+def _is_number_row(row: str, delimiter: Optional[str]) -> bool:
+    try:
+        [float(el) for el in row.split(delimiter)[:2]]
+    except ValueError:
+        return False
+    return True
+
+
+def deduplicate(coordinates: np.ndarray, existing: Optional[np.ndarray] = None, eps: float = EPS) -> np.ndarray:
+    """
+    Поиск точек, совпадающих с более ранними точками набора или с уже существующими точками. Точки совпадают, если их
+    координаты различаются меньше чем на eps, как в Point.__eq__. Точки раскладываются по сетке с шагом eps, поэтому
+    совпадающие точки лежат в одной или в соседних ячейках. Координаты, номер ячейки которых не меньше _CELL_LIMIT по
+    модулю, сравниваются точно и получают отдельные номера за пределами сетки.
+
+    :param coordinates: Массив координат формы (N, 2)
+    :param existing: Координаты уже существующих точек формы (M, 2)
+    :param eps: Точность сравнения
+    :return: Булев массив формы (N,): True для точек, которые нужно оставить
+    """
+    old_count: int = 0 if existing is None else len(existing)
+    if existing is not None and old_count:
+        coordinates = np.concatenate((existing, coordinates))
+    count: int = len(coordinates)
+    if count == 0:
+        return np.ones(0, dtype=bool)
+    scaled: np.ndarray = coordinates / eps
+    outside: np.ndarray = ~(np.abs(scaled) < _CELL_LIMIT)
+    cells: np.ndarray = np.floor(np.where(outside, 0.0, scaled)).astype(np.int64)
+    if outside.any():
+        values, ranks = np.unique(coordinates[outside], return_inverse=True)
+        offset: int = 2 * int(_CELL_LIMIT)
+        cells[outside] = np.where(values[ranks] > 0, offset + ranks, -offset - ranks)
+    unique_x, rank_x = np.unique(cells[:, 0], return_inverse=True)
+    unique_y, rank_y = np.unique(cells[:, 1], return_inverse=True)
+    keys: np.ndarray = rank_x * len(unique_y) + rank_y
+    order: np.ndarray = np.argsort(keys, kind="stable")
+    sorted_keys: np.ndarray = keys[order]
+    first: np.ndarray = np.ones(count, dtype=bool)
+    first[1:] = sorted_keys[1:] != sorted_keys[:-1]
+    duplicate: np.ndarray = np.zeros(count, dtype=bool)
+    duplicate[order[~first]] = True
+    representatives: np.ndarray = order[first]
+    representative_keys: np.ndarray = sorted_keys[first]
+    for dx, dy in ((1, -1), (1, 0), (1, 1), (0, 1)):
+        neighbour_x: np.ndarray = unique_x[rank_x[representatives]] + dx
+        neighbour_y: np.ndarray = unique_y[rank_y[representatives]] + dy
+        pos_x: np.ndarray = np.minimum(np.searchsorted(unique_x, neighbour_x), len(unique_x) - 1)
+        pos_y: np.ndarray = np.minimum(np.searchsorted(unique_y, neighbour_y), len(unique_y) - 1)
+        neighbour_keys: np.ndarray = pos_x * len(unique_y) + pos_y
+        pos: np.ndarray = np.minimum(np.searchsorted(representative_keys, neighbour_keys), len(representatives) - 1)
+        valid: np.ndarray = ((unique_x[pos_x] == neighbour_x) & (unique_y[pos_y] == neighbour_y)
+                             & (representative_keys[pos] == neighbour_keys))
+        a: np.ndarray = representatives[valid]
+        b: np.ndarray = representatives[pos[valid]]
+        close: np.ndarray = np.all(np.abs(coordinates[a] - coordinates[b]) < eps, axis=1)
+        duplicate[np.maximum(a, b)[close]] = True
+    return ~duplicate[old_count:]
+
+
+def clean_points(coordinates: np.ndarray, existing: Optional[np.ndarray] = None, eps: float = EPS) -> np.ndarray:
+    """
+    Подготовка загруженных точек: удаление точек с нечисловыми координатами (nan, inf) и дубликатов.
+
+    :param coordinates: Массив координат формы (N, 2)
+    :param existing: Координаты уже существующих точек формы (M, 2)
+    :param eps: Точность сравнения точек
+    :return: Массив координат оставшихся точек формы (K, 2)
+    """
+    coordinates = np.asarray(coordinates, dtype=np.float64)
+    if coordinates.ndim != 2 or coordinates.shape[1] != 2:
+        raise ValueError
+    coordinates = coordinates[np.all(np.isfinite(coordinates), axis=1)]
+    return coordinates[deduplicate(coordinates, existing, eps)]
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+from typing import Iterator, Optional
+
+import numpy as np
+
+
+class PointStore:
+    """
+    Хранилище точек в виде структуры массивов. Координаты лежат в непрерывных массивах xs и ys, точки адресуются
+    постоянными целочисленными id. Id выдаются по возрастанию и никогда не используются повторно. Удаление выполняется
+    за O(1): на место удаленной точки переносится последняя, поэтому плотный индекс точки может меняться, а id - нет.
+
+    :param capacity: Начальный размер буферов
+    :param dtype: Тип координат: np.float64 или np.float32
+    """
+
+    def __init__(self, capacity: int = 16, dtype: type = np.float64):
+        self._xs: np.ndarray = np.empty(capacity, dtype=dtype)
+        self._ys: np.ndarray = np.empty(capacity, dtype=dtype)
+        self._ids: np.ndarray = np.empty(capacity, dtype=np.int64)
+        self._index: dict[int, int] = {}
+        self._size: int = 0
+        self._next_id: int = 1
+
+    @property
+    def xs(self) -> np.ndarray:
+        """
+        Координаты x точек в порядке плотных индексов. Возвращается представление без копирования, которое
+        становится недействительным после добавления или удаления точек.
+        """
+        return self._xs[:self._size]
+
+    @property
+    def ys(self) -> np.ndarray:
+        """
+        Координаты y точек в порядке плотных индексов. Возвращается представление без копирования, которое
+        становится недействительным после добавления или удаления точек.
+        """
+        return self._ys[:self._size]
+
+    @property
+    def ids(self) -> np.ndarray:
+        """
+        Id точек в порядке плотных индексов.
+        """
+        return self._ids[:self._size]
+
+    def _reserve(self, size: int) -> None:
+        if size <= len(self._xs):
+            return
+        capacity: int = max(size, 2 * len(self._xs))
+        for name in ("_xs", "_ys", "_ids"):
+            old: np.ndarray = getattr(self, name)
+            new: np.ndarray = np.empty(capacity, dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, name, new)
+
+    def add(self, x: float, y: float) -> int:
+        """
+        Добавление точки.
+
+        :param x: Координата точки
+        :param y: Координата точки
+        :return: Id новой точки
+        """
+        self._reserve(self._size + 1)
+        point_id: int = self._next_id
+        self._xs[self._size] = x
+        self._ys[self._size] = y
+        self._ids[self._size] = point_id
+        self._index[point_id] = self._size
+        self._size += 1
+        self._next_id += 1
+        return point_id
+
+    def add_many(self, xs: np.ndarray, ys: np.ndarray) -> np.ndarray:
+        """
+        Добавление набора точек.
+
+        :param xs: Координаты x точек
+        :param ys: Координаты y точек
+        :return: Id новых точек
+        """
+        count: int = len(xs)
+        self._reserve(self._size + count)
+        new_ids: np.ndarray = np.arange(self._next_id, self._next_id + count, dtype=np.int64)
+        self._xs[self._size:self._size + count] = xs
+        self._ys[self._size:self._size + count] = ys
+        self._ids[self._size:self._size + count] = new_ids
+        self._index.update(zip(new_ids.tolist(), range(self._size, self._size + count)))
+        self._size += count
+        self._next_id += count
+        return new_ids
+
+    def remove(self, point_id: int) -> None:
+        """
+        Удаление точки. На ее место переносится последняя точка.
+
+        :param point_id: Id точки
+        :return: None
+        """
+        index: int = self._index.pop(point_id)
+        last: int = self._size - 1
+        if index != last:
+            self._xs[index] = self._xs[last]
+            self._ys[index] = self._ys[last]
+            self._ids[index] = self._ids[last]
+            self._index[int(self._ids[index])] = index
+        self._size -= 1
+
+    def clear(self) -> None:
+        self._index.clear()
+        self._size = 0
+
+    def index(self, point_id: int) -> int:
+        return self._index[point_id]
+
+    def get(self, point_id: int) -> tuple[float, float]:
+        index: int = self._index[point_id]
+        return float(self._xs[index]), float(self._ys[index])
+
+    def set(self, point_id: int, x: Optional[float] = None, y: Optional[float] = None) -> None:
+        index: int = self._index[point_id]
+        if x is not None:
+            self._xs[index] = x
+        if y is not None:
+            self._ys[index] = y
+
+    def move(self, point_id: int, dx: float, dy: float) -> None:
+        index: int = self._index[point_id]
+        self._xs[index] += dx
+        self._ys[index] += dy
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, point_id: int) -> bool:
+        return point_id in self._index
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(self.ids.tolist())
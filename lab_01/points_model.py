@@ -0,0 +1,157 @@
+from typing import Any, Optional
+
+import numpy as np
+from PyQt6 import QtCore
+from PyQt6.QtCore import QModelIndex, Qt
+
+from mediator import SceneObjects
+
+
+class PointsTableModel(QtCore.QAbstractTableModel):
+    """
+    Модель таблицы точек поверх хранилища точек SceneObjects. Строки идут в порядке добавления точек: модель хранит
+    возрастающий массив id, так как id выдаются по возрастанию, поэтому строка по id находится двоичным поиском.
+    Хранилище при удалении переносит на место удаленной точки последнюю, но порядок строк от этого не меняется.
+    Значения ячеек читаются из массивов координат только для видимых строк.
+
+    :param scene_objects: Объекты сцены
+    :param parent: Родительский объект Qt
+    """
+    ID_COLUMN: int = 0
+    X_COLUMN: int = 1
+    Y_COLUMN: int = 2
+    _headers: tuple[str, ...] = ("Id", "x", "y")
+
+    point_changed = QtCore.pyqtSignal(int)
+    invalid_value = QtCore.pyqtSignal(int, int)
+
+    def __init__(self, scene_objects: SceneObjects, parent: Optional[QtCore.QObject] = None):
+        super().__init__(parent)
+        self.scene_objects = scene_objects
+        self._order: np.ndarray = np.sort(scene_objects.points.ids)
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._order)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._headers)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self._headers[section]
+        return super().headerData(section, orientation, role)
+
+    def data(self, index: QModelIndex, role: int = Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid() or role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return None
+        point_id: int = self.point_id(index.row())
+        if index.column() == self.ID_COLUMN:
+            return str(point_id)
+        point_index: int = self.scene_objects.points.index(point_id)
+        if index.column() == self.X_COLUMN:
+            value: np.generic = self.scene_objects.points.xs[point_index]
+        else:
+            value = self.scene_objects.points.ys[point_index]
+        return str(value.item())
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlag:
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        if index.column() == self.ID_COLUMN:
+            return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEditable
+
+    def setData(self, index: QModelIndex, value: Any, role: int = Qt.ItemDataRole.EditRole) -> bool:
+        """
+        Изменение координаты точки из таблицы. При некорректном значении координата не меняется и испускается сигнал
+        invalid_value.
+
+        :param index: Индекс ячейки
+        :param value: Новое значение
+        :param role: Роль данных
+        :return: Было ли изменено значение
+        """
+        if not index.isValid() or role != Qt.ItemDataRole.EditRole or index.column() == self.ID_COLUMN:
+            return False
+        try:
+            new_value: float = float(value)
+        except (TypeError, ValueError):
+            self.invalid_value.emit(index.row(), index.column())
+            return False
+        point_id: int = self.point_id(index.row())
+        if index.column() == self.X_COLUMN:
+            self.scene_objects.set_point_pos(point_id, x=new_value)
+        else:
+            self.scene_objects.set_point_pos(point_id, y=new_value)
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole])
+        self.point_changed.emit(point_id)
+        return True
+
+    def point_id(self, row: int) -> int:
+        return int(self._order[row])
+
+    def row(self, point_id: int) -> int:
+        return int(np.searchsorted(self._order, point_id))
+
+    def add_point(self, x: float, y: float) -> int:
+        """
+        Добавление точки в конец таблицы.
+
+        :param x: Координата точки
+        :param y: Координата точки
+        :return: Id новой точки
+        :raises ValueError: Если такая точка уже существует
+        """
+        if self.scene_objects.find_point(x, y) is not None:
+            raise ValueError
+        row: int = self.rowCount()
+        self.beginInsertRows(QModelIndex(), row, row)
+        try:
+            point_id: int = self.scene_objects.add_point(x, y)
+            self._order = np.append(self._order, point_id)
+            return point_id
+        finally:
+            self.endInsertRows()
+
+    def load_points(self, path: str) -> np.ndarray:
+        """
+        Загрузка точек из файла. Все новые строки добавляются одной вставкой.
+
+        :param path: Путь к файлу
+        :return: Id новых точек
+        :raises ValueError: Если файл не содержит пар координат
+        """
+        coordinates: np.ndarray = self.scene_objects.read_points(path)
+        if not len(coordinates):
+            return np.empty(0, dtype=np.int64)
+        first_row: int = self.rowCount()
+        self.beginInsertRows(QModelIndex(), first_row, first_row + len(coordinates) - 1)
+        try:
+            points_id: np.ndarray = self.scene_objects.add_points(coordinates[:, 0], coordinates[:, 1])
+            self._order = np.concatenate((self._order, points_id))
+            return points_id
+        finally:
+            self.endInsertRows()
+
+    def remove_point(self, row: int) -> None:
+        """
+        Удаление точки. Следующие строки сдвигаются на одну вверх.
+
+        :param row: Строка точки
+        :return: None
+        """
+        point_id: int = self.point_id(row)
+        self.beginRemoveRows(QModelIndex(), row, row)
+        try:
+            self.scene_objects.remove_point(point_id)
+            self._order = np.delete(self._order, row)
+        finally:
+            self.endRemoveRows()
+
+    def clear(self) -> None:
+        self.beginResetModel()
+        try:
+            self.scene_objects.remove_all()
+            self._order = np.empty(0, dtype=np.int64)
+        finally:
+            self.endResetModel()
@@ -0,0 +1,249 @@
+from __future__ import annotations
+
+import heapq
+from typing import Final, Iterable, Iterator, Optional
+
+import numpy as np
+
+import logic
+
+DEFAULT_CHUNK_SIZE: Final[int] = 1 << 16
+
+PairIndex = tuple[int, int]
+TripleIndex = tuple[int, int, int]
+
+
+def iter_triples(n: int, chunk_size: int = DEFAULT_CHUNK_SIZE, start: PairIndex = (0, 1),
+                 stop: Optional[PairIndex] = None) -> Iterator[tuple[int, np.ndarray, np.ndarray]]:
+    """
+    Перебор всех троек индексов i < k < z блоками. Тройки выдаются в лексикографическом порядке, поэтому первая
+    тройка с максимальной оценкой совпадает с той, которую нашел бы обычный тройной цикл. Перебор можно ограничить
+    диапазоном пар (i, k), чтобы разделить работу между несколькими процессами.
+
+    :param n: Количество точек
+    :param chunk_size: Примерное максимальное количество троек в одном блоке
+    :param start: Первая обрабатываемая пара (i, k)
+    :param stop: Пара (i, k), на которой перебор останавливается (не включительно)
+    :return: Итератор по блокам вида (i, массив k, массив z)
+    """
+    if stop is None:
+        stop = (n - 2, n - 1)
+    for i in range(start[0], min(stop[0] + 1, n - 2)):
+        k_start: int = start[1] if i == start[0] else i + 1
+        k_stop: int = stop[1] if i == stop[0] else n - 1
+        all_ks: np.ndarray = np.arange(k_start, k_stop)
+        all_counts: np.ndarray = n - 1 - all_ks
+        cumulative: np.ndarray = np.cumsum(all_counts)
+        first: int = 0
+        done: int = 0
+        while first < len(all_ks):
+            last: int = max(int(np.searchsorted(cumulative, done + chunk_size, side="right")), first + 1)
+            ks: np.ndarray = all_ks[first:last]
+            counts: np.ndarray = all_counts[first:last]
+            offsets: np.ndarray = np.cumsum(counts) - counts
+            zs: np.ndarray = np.arange(counts.sum()) - np.repeat(offsets, counts) + np.repeat(ks + 1, counts)
+            yield i, np.repeat(ks, counts), zs
+            done = int(cumulative[last - 1])
+            first = last
+
+
+def iter_pairs(m: int, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """
+    Перебор всех пар индексов a < b блоками в лексикографическом порядке.
+
+    :param m: Количество элементов
+    :param chunk_size: Примерное максимальное количество пар в одном блоке
+    :return: Итератор по блокам вида (массив a, массив b)
+    """
+    all_as: np.ndarray = np.arange(m - 1)
+    all_counts: np.ndarray = m - 1 - all_as
+    cumulative: np.ndarray = np.cumsum(all_counts)
+    first: int = 0
+    done: int = 0
+    while first < len(all_as):
+        last: int = max(int(np.searchsorted(cumulative, done + chunk_size, side="right")), first + 1)
+        as_: np.ndarray = all_as[first:last]
+        counts: np.ndarray = all_counts[first:last]
+        offsets: np.ndarray = np.cumsum(counts) - counts
+        bs: np.ndarray = np.arange(counts.sum()) - np.repeat(offsets, counts) + np.repeat(as_ + 1, counts)
+        yield np.repeat(as_, counts), bs
+        done = int(cumulative[last - 1])
+        first = last
+
+
+def iter_triples_with(n: int, j: int, chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[np.ndarray]:
+    """
+    Перебор всех троек индексов, содержащих индекс j. Индексы внутри каждой тройки упорядочены по возрастанию.
+
+    :param n: Количество точек
+    :param j: Индекс, входящий в каждую тройку
+    :param chunk_size: Примерное максимальное количество троек в одном блоке
+    :return: Итератор по массивам троек формы (N, 3)
+    """
+    others: np.ndarray = np.delete(np.arange(n), j)
+    for as_, bs in iter_pairs(len(others), chunk_size):
+        triples: np.ndarray = np.empty((len(as_), 3), dtype=np.int64)
+        triples[:, 0] = others[as_]
+        triples[:, 1] = others[bs]
+        triples[:, 2] = j
+        triples.sort(axis=1)
+        yield triples
+
+
+def gather_triangles(xs: np.ndarray, ys: np.ndarray, i: int | np.ndarray, ks: np.ndarray,
+                     zs: np.ndarray) -> np.ndarray:
+    """
+    Сборка массива треугольников (i, k, z) формы (N, 3, 2) из координат точек.
+
+    :param xs: Координаты x точек
+    :param ys: Координаты y точек
+    :param i: Индексы первых вершин или один индекс, общий для всех треугольников
+    :param ks: Индексы вторых вершин
+    :param zs: Индексы третьих вершин
+    :return: Массив координат вершин
+    """
+    # Координаты хранятся покомпонентно, чтобы пакетные функции logic работали с непрерывными массивами
+    triangles: np.ndarray = np.empty((2, 3, len(ks)), dtype=np.float64).transpose(2, 1, 0)
+    triangles[:, 0, 0] = xs[i]
+    triangles[:, 0, 1] = ys[i]
+    triangles[:, 1, 0] = xs[ks]
+    triangles[:, 1, 1] = ys[ks]
+    triangles[:, 2, 0] = xs[zs]
+    triangles[:, 2, 1] = ys[zs]
+    return triangles
+
+
+def triangle_scores(triangles: np.ndarray) -> np.ndarray:
+    """
+    Разность площадей описанной окружности и треугольника для набора треугольников. Вырожденные треугольники
+    (совпадающие вершины или вершины на одной прямой) получают оценку -inf.
+
+    :param triangles: Массив формы (N, 3, 2) с координатами вершин
+    :return: Массив оценок
+    """
+    scores: np.ndarray = logic.batch_circumcircle_square(triangles) - logic.batch_square(triangles)
+    scores[logic.batch_degenerate(triangles)] = -np.inf
+    return scores
+
+
+def score_triples(xs: np.ndarray, ys: np.ndarray, triples: list[TripleIndex]) -> list[tuple[TripleIndex, float]]:
+    """
+    Оценка заданных троек теми же вычислениями, что и при полном переборе, поэтому оценки совпадают с его
+    результатом. Вырожденные тройки отбрасываются.
+
+    :param xs: Координаты x точек
+    :param ys: Координаты y точек
+    :param triples: Тройки индексов вершин, упорядоченные по возрастанию
+    :return: Список пар (индексы вершин, оценка)
+    """
+    if not triples:
+        return []
+    indices: np.ndarray = np.array(triples, dtype=np.int64)
+    scores: np.ndarray = triangle_scores(gather_triangles(np.asarray(xs, dtype=np.float64),
+                                                          np.asarray(ys, dtype=np.float64),
+                                                          indices[:, 0], indices[:, 1], indices[:, 2]))
+    return [(triple, score) for triple, score in zip(triples, scores.tolist()) if score > 0]
+
+
+def rank_key(result: tuple[TripleIndex, float]) -> tuple[float, int, int, int]:
+    """
+    Ключ сравнения результатов поиска: больше оценка - лучше, при равных оценках лучше тройка, идущая раньше.
+    """
+    (i, k, z), score = result
+    return score, -i, -k, -z
+
+
+def merge_top(results: Iterable[tuple[TripleIndex, float]], k: int) -> list[tuple[TripleIndex, float]]:
+    """
+    Объединение нескольких списков результатов в общий список k лучших.
+
+    :param results: Результаты поиска
+    :param k: Количество лучших результатов
+    :return: Список k лучших результатов, от лучшего к худшему
+    """
+    return heapq.nlargest(k, results, key=rank_key)
+
+
+def _push_top(heap: list[tuple[float, int, int, int]], k: int, scores: np.ndarray, is_: np.ndarray, ks: np.ndarray,
+              zs: np.ndarray) -> None:
+    """
+    Добавление блока оценок в кучу из k лучших троек. В куче хранятся кортежи (оценка, -i, -k, -z), так что ее
+    минимальный элемент - худшая из сохраненных троек.
+    """
+    threshold: float = heap[0][0] if len(heap) == k else 0.0
+    candidates: np.ndarray = np.flatnonzero(scores >= threshold if threshold > 0 else scores > 0)
+    if len(candidates) > k:
+        kth: float = np.partition(scores[candidates], len(candidates) - k)[len(candidates) - k]
+        candidates = candidates[scores[candidates] >= kth]
+    for j in candidates:
+        item: tuple[float, int, int, int] = (float(scores[j]), -int(is_[j]), -int(ks[j]), -int(zs[j]))
+        if len(heap) < k:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+
+
+def find_best_triangles(xs: np.ndarray, ys: np.ndarray, k: int, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                        start: PairIndex = (0, 1), stop: Optional[PairIndex] = None
+                        ) -> list[tuple[TripleIndex, float]]:
+    """
+    Поиск k треугольников с максимальной разностью площадей описанной окружности и самого треугольника. Во время
+    перебора хранится только куча из k лучших троек, поэтому потребление памяти не зависит от количества точек.
+
+    :param xs: Координаты x точек
+    :param ys: Координаты y точек
+    :param k: Количество искомых треугольников
+    :param chunk_size: Примерное максимальное количество троек, обрабатываемых за один раз
+    :param start: Первая рассматриваемая пара (i, k)
+    :param stop: Пара (i, k), на которой поиск останавливается (не включительно)
+    :return: Список из не более чем k пар (индексы вершин, оценка), от лучшего треугольника к худшему
+    """
+    xs = np.asarray(xs, dtype=np.float64)
+    ys = np.asarray(ys, dtype=np.float64)
+    heap: list[tuple[float, int, int, int]] = []
+    if k <= 0:
+        return []
+    for i, ks, zs in iter_triples(len(xs), chunk_size, start, stop):
+        _push_top(heap, k, triangle_scores(gather_triangles(xs, ys, i, ks, zs)), np.broadcast_to(i, ks.shape), ks, zs)
+    return [((-i, -k, -z), score) for score, i, k, z in sorted(heap, reverse=True)]
+
+
+def find_best_triangles_with(xs: np.ndarray, ys: np.ndarray, j: int, k: int,
+                             chunk_size: int = DEFAULT_CHUNK_SIZE) -> list[tuple[TripleIndex, float]]:
+    """
+    Поиск k лучших треугольников среди тех, одна из вершин которых - точка с индексом j. Используется для
+    обновления результата поиска после добавления или перемещения одной точки за O(n^2) вместо O(n^3).
+
+    :param xs: Координаты x точек
+    :param ys: Координаты y точек
+    :param j: Индекс точки
+    :param k: Количество искомых треугольников
+    :param chunk_size: Примерное максимальное количество троек, обрабатываемых за один раз
+    :return: Список из не более чем k пар (индексы вершин, оценка), от лучшего треугольника к худшему
+    """
+    xs = np.asarray(xs, dtype=np.float64)
+    ys = np.asarray(ys, dtype=np.float64)
+    heap: list[tuple[float, int, int, int]] = []
+    if k <= 0:
+        return []
+    for triples in iter_triples_with(len(xs), j, chunk_size):
+        scores: np.ndarray = triangle_scores(gather_triangles(xs, ys, triples[:, 0], triples[:, 1], triples[:, 2]))
+        _push_top(heap, k, scores, triples[:, 0], triples[:, 1], triples[:, 2])
+    return [((-i, -k, -z), score) for score, i, k, z in sorted(heap, reverse=True)]
+
+
+def find_best_triangle(xs: np.ndarray, ys: np.ndarray, chunk_size: int = DEFAULT_CHUNK_SIZE, start: PairIndex = (0, 1),
+                       stop: Optional[PairIndex] = None) -> Optional[tuple[TripleIndex, float]]:
+    """
+    Поиск треугольника с максимальной разностью площадей описанной окружности и самого треугольника. При равных
+    оценках выбирается тройка индексов, идущая раньше в лексикографическом порядке.
+
+    :param xs: Координаты x точек
+    :param ys: Координаты y точек
+    :param chunk_size: Примерное максимальное количество троек, обрабатываемых за один раз
+    :param start: Первая рассматриваемая пара (i, k)
+    :param stop: Пара (i, k), на которой поиск останавливается (не включительно)
+    :return: Индексы вершин найденного треугольника и его оценка или None, если треугольник не найден
+    """
+    best: list[tuple[TripleIndex, float]] = find_best_triangles(xs, ys, 1, chunk_size, start, stop)
+    return best[0] if best else None
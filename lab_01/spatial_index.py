@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import gc
+import math
+from typing import Final, Iterable, Iterator, Optional
+
+import numpy as np
+
+EPS: Final[float] = 1e-6
+_INT64_LIMIT: Final[float] = 2.0 ** 63
+
+
+class SpatialIndex:
+    """
+    Пространственный хеш точек на равномерной сетке. Каждая точка хранится в ячейке, содержащей ее координаты, поэтому
+    поиск совпадающих точек и точек в окрестности просматривает только несколько ячеек. Точки сравниваются с
+    точностью eps, как в logic.Point.__eq__, а не по точному значению координат. Точки, добавленные набором, попадают
+    в ячейки при первом обращении к индексу, поэтому массовая загрузка не замедляется.
+
+    :param cell_size: Размер ячейки сетки
+    :param eps: Точность сравнения точек
+    """
+
+    def __init__(self, cell_size: float = 1.0, eps: float = EPS):
+        if cell_size <= 0:
+            raise ValueError
+        self.cell_size = cell_size
+        self.eps = eps
+        self._cells: dict[tuple[int, int], dict[int, tuple[float, float]]] = {}
+        self._cell_of: dict[int, tuple[int, int]] = {}
+        self._pending: list[tuple[np.ndarray, np.ndarray, np.ndarray]] = []
+
+    def _cell(self, x: float, y: float) -> tuple[int, int]:
+        return math.floor(x / self.cell_size), math.floor(y / self.cell_size)
+
+    def _cell_coordinates(self, values: np.ndarray) -> list[int]:
+        """
+        Номера ячеек для набора координат, совпадающие с номерами из _cell.
+
+        :param values: Координаты
+        :return: Номера ячеек
+        """
+        scaled: np.ndarray = values / self.cell_size
+        cells: np.ndarray = np.floor(scaled)
+        if np.all(np.abs(cells) < _INT64_LIMIT):
+            return cells.astype(np.int64).tolist()
+        # Номера ячеек не помещаются в int64: вычисляются так же, как в _cell
+        return [math.floor(value) for value in scaled.tolist()]
+
+    def _cells_in_box(self, x_min: float, y_min: float, x_max: float, y_max: float
+                      ) -> Iterator[dict[int, tuple[float, float]]]:
+        first_x, first_y = self._cell(x_min, y_min)
+        last_x, last_y = self._cell(x_max, y_max)
+        if (last_x - first_x + 1) * (last_y - first_y + 1) > len(self._cells):
+            # Прямоугольник покрывает больше ячеек, чем занято: быстрее просмотреть все занятые
+            for (cell_x, cell_y), cell in self._cells.items():
+                if first_x <= cell_x <= last_x and first_y <= cell_y <= last_y:
+                    yield cell
+            return
+        for cell_x in range(first_x, last_x + 1):
+            for cell_y in range(first_y, last_y + 1):
+                cell: Optional[dict[int, tuple[float, float]]] = self._cells.get((cell_x, cell_y))
+                if cell is not None:
+                    yield cell
+
+    def insert(self, point_id: int, x: float, y: float) -> None:
+        """
+        Добавление точки в индекс.
+
+        :param point_id: Id точки
+        :param x: Координата точки
+        :param y: Координата точки
+        :return: None
+        """
+        self._flush()
+        cell: tuple[int, int] = self._cell(x, y)
+        self._cells.setdefault(cell, {})[point_id] = (x, y)
+        self._cell_of[point_id] = cell
+
+    def insert_many(self, points_id: np.ndarray, xs: np.ndarray, ys: np.ndarray) -> None:
+        """
+        Добавление набора точек в индекс. Точки раскладываются по ячейкам при первом обращении к индексу.
+
+        :param points_id: Id точек
+        :param xs: Координаты x точек
+        :param ys: Координаты y точек
+        :return: None
+        """
+        self._pending.append((np.array(points_id, dtype=np.int64), np.array(xs, dtype=np.float64),
+                              np.array(ys, dtype=np.float64)))
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        pending: list[tuple[np.ndarray, np.ndarray, np.ndarray]] = self._pending
+        self._pending = []
+        # Создание миллионов кортежей запускает сборщик мусора, который при этом не может ничего освободить
+        gc_enabled: bool = gc.isenabled()
+        gc.disable()
+        try:
+            for points_id, xs, ys in pending:
+                cells: zip = zip(self._cell_coordinates(xs), self._cell_coordinates(ys))
+                for point_id, x, y, cell in zip(points_id.tolist(), xs.tolist(), ys.tolist(), cells):
+                    points: Optional[dict[int, tuple[float, float]]] = self._cells.get(cell)
+                    if points is None:
+                        self._cells[cell] = {point_id: (x, y)}
+                    else:
+                        points[point_id] = (x, y)
+                    self._cell_of[point_id] = cell
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+    def remove(self, point_id: int) -> None:
+        """
+        Удаление точки из индекса.
+
+        :param point_id: Id точки
+        :return: None
+        """
+        self._flush()
+        cell: tuple[int, int] = self._cell_of.pop(point_id)
+        points: dict[int, tuple[float, float]] = self._cells[cell]
+        del points[point_id]
+        if not points:
+            del self._cells[cell]
+
+    def update(self, point_id: int, x: float, y: float) -> None:
+        """
+        Обновление координат точки после ее перемещения.
+
+        :param point_id: Id точки
+        :param x: Новая координата точки
+        :param y: Новая координата точки
+        :return: None
+        """
+        self._flush()
+        if self._cell_of.get(point_id) == self._cell(x, y):
+            self._cells[self._cell_of[point_id]][point_id] = (x, y)
+            return
+        self.remove(point_id)
+        self.insert(point_id, x, y)
+
+    def clear(self) -> None:
+        self._pending.clear()
+        self._cells.clear()
+        self._cell_of.clear()
+
+    def find(self, x: float, y: float) -> Optional[int]:
+        """
+        Поиск точки, совпадающей с заданной с точностью eps.
+
+        :param x: Координата точки
+        :param y: Координата точки
+        :return: Id найденной точки или None
+        """
+        self._flush()
+        for cell in self._cells_in_box(x - self.eps, y - self.eps, x + self.eps, y + self.eps):
+            for point_id, (px, py) in cell.items():
+                if abs(px - x) < self.eps and abs(py - y) < self.eps:
+                    return point_id
+        return None
+
+    def query_radius(self, x: float, y: float, radius: float) -> list[int]:
+        """
+        Поиск точек, находящихся на расстоянии не больше radius от заданной.
+
+        :param x: Координата центра
+        :param y: Координата центра
+        :param radius: Радиус поиска
+        :return: Id найденных точек
+        """
+        self._flush()
+        radius_squared: float = radius * radius
+        return [point_id
+                for cell in self._cells_in_box(x - radius, y - radius, x + radius, y + radius)
+                for point_id, (px, py) in cell.items()
+                if (px - x) ** 2 + (py - y) ** 2 <= radius_squared]
+
+    def nearest(self, x: float, y: float, max_distance: Optional[float] = None) -> Optional[int]:
+        """
+        Поиск ближайшей точки. Ячейки просматриваются кольцами вокруг ячейки заданной точки, пока следующее кольцо
+        не окажется дальше уже найденной точки. Если кольцо содержит больше ячеек, чем занято во всем индексе,
+        оставшиеся точки просматриваются целиком.
+
+        :param x: Координата точки
+        :param y: Координата точки
+        :param max_distance: Максимальное расстояние до искомой точки
+        :return: Id ближайшей точки или None, если в индексе нет точек на расстоянии не больше max_distance
+        """
+        self._flush()
+        limit: float = math.inf if max_distance is None else max_distance
+        best: tuple[float, Optional[int]] = (math.inf, None)
+        center_x, center_y = self._cell(x, y)
+        ring: int = 0
+        # Точки вне просмотренных колец находятся дальше, чем (ring - 1) * cell_size
+        while (ring - 1) * self.cell_size <= min(best[0], limit):
+            if 8 * ring > len(self._cells):
+                best = self._nearest_in(self._cells.values(), x, y, best)
+                break
+            ring_cells: Iterator[Optional[dict[int, tuple[float, float]]]] = (
+                self._cells.get((cell_x, cell_y))
+                for cell_x in range(center_x - ring, center_x + ring + 1)
+                for cell_y in range(center_y - ring, center_y + ring + 1)
+                if max(abs(cell_x - center_x), abs(cell_y - center_y)) == ring)
+            best = self._nearest_in((cell for cell in ring_cells if cell is not None), x, y, best)
+            ring += 1
+        return best[1] if best[0] <= limit else None
+
+    @staticmethod
+    def _nearest_in(cells: Iterable[dict[int, tuple[float, float]]], x: float, y: float,
+                    best: tuple[float, Optional[int]]) -> tuple[float, Optional[int]]:
+        for cell in cells:
+            for point_id, (px, py) in cell.items():
+                distance: float = math.hypot(px - x, py - y)
+                if distance < best[0]:
+                    best = (distance, point_id)
+        return best
+
+    def __len__(self) -> int:
+        self._flush()
+        return len(self._cell_of)
+
+    def __contains__(self, point_id: int) -> bool:
+        self._flush()
+        return point_id in self._cell_of
@@ -0,0 +1,60 @@
+import random
+import unittest
+from typing import Callable
+
+import mediator
+import selection
+
+
+class SelectedTrianglesCacheTest(unittest.TestCase):
+    """
+    Сохраненный результат поиска после добавления, перемещения и удаления точек должен совпадать с полным перебором.
+    """
+
+    def full_rescan(self, scene_objects: mediator.SceneObjects, k: int) -> list[tuple[tuple[int, int, int], float]]:
+        points_id_list: list[int] = scene_objects.points.ids.tolist()
+        best: list[tuple[selection.TripleIndex, float]] = selection.find_best_triangles(
+            scene_objects.points.xs, scene_objects.points.ys, k)
+        return [(tuple(points_id_list[i] for i in triple), score) for triple, score in best]
+
+    def check_sequence(self, seed: int, k: int, coordinate: Callable[[random.Random], float]) -> None:
+        rng: random.Random = random.Random(seed)
+        scene_objects: mediator.SceneObjects = mediator.SceneObjects()
+        for _ in range(8):
+            try:
+                scene_objects.add_point(coordinate(rng), coordinate(rng))
+            except ValueError:
+                pass
+        for step in range(60):
+            ids: list[int] = scene_objects.points.ids.tolist()
+            action: int = rng.randrange(3) if len(ids) > 4 else 0
+            try:
+                if action == 0:
+                    scene_objects.add_point(coordinate(rng), coordinate(rng))
+                elif action == 1:
+                    scene_objects.set_point_pos(rng.choice(ids), coordinate(rng), coordinate(rng))
+                else:
+                    scene_objects.remove_point(rng.choice(ids))
+            except ValueError:
+                continue
+            # Запрос выполняется не после каждого изменения, чтобы сохраненный результат обновлялся несколько раз подряд
+            if rng.random() < 0.3:
+                count: int = rng.randint(1, k)
+                with self.subTest(seed=seed, k=count, step=step):
+                    self.assertEqual(scene_objects.find_selected_triangles(count),
+                                     self.full_rescan(scene_objects, count))
+
+    def test_cache_matches_full_rescan_on_grid(self):
+        # Целочисленная сетка дает много треугольников с равными оценками
+        for seed in range(20):
+            for k in (1, 2, 5):
+                self.check_sequence(seed, k, lambda rng: float(rng.randrange(6)))
+
+    def test_cache_matches_full_rescan(self):
+        for seed in range(20):
+            for k in (1, 3, 8):
+                self.check_sequence(seed, k, lambda rng: rng.uniform(-100, 100))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,87 @@
+import argparse
+import copy
+import time
+import tracemalloc
+
+import logic
+import mediator
+
+
+def measure_house(count: int) -> int:
+    """
+    Средний объем памяти, занимаемый одним домом.
+
+    :param count: Количество создаваемых домов
+    :return: Количество байт на один дом
+    """
+    tracemalloc.start()
+    start: int = tracemalloc.get_traced_memory()[0]
+    houses: list[logic.House] = [logic.House(logic.Point(0, 0)) for _ in range(count)]
+    used: int = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    del houses
+    return used // count
+
+
+def measure_snapshot(count: int) -> int:
+    """
+    Средний объем памяти, занимаемый одним снимком сцены для отмены операций.
+
+    :param count: Количество создаваемых снимков
+    :return: Количество байт на один снимок
+    """
+    scene_objects: mediator.SceneObjects = mediator.SceneObjects((0, 0))
+    tracemalloc.start()
+    start: int = tracemalloc.get_traced_memory()[0]
+    states: list[mediator.SceneState] = [mediator.SceneState(scene_objects._scene_center, scene_objects.objects)
+                                         for _ in range(count)]
+    used: int = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    del states
+    return used // count
+
+
+def measure_deepcopy_time(count: int) -> float:
+    """
+    Среднее время глубокого копирования дома.
+
+    :param count: Количество копирований
+    :return: Время одного копирования в секундах
+    """
+    house: logic.House = logic.House(logic.Point(0, 0))
+    start: float = time.perf_counter()
+    for _ in range(count):
+        copy.deepcopy(house)
+    return (time.perf_counter() - start) / count
+
+
+def measure_history(count: int, memory_budget: int) -> tuple[int, int]:
+    """
+    Объем истории отмены после count поворотов сцены.
+
+    :param count: Количество операций
+    :param memory_budget: Наибольший объем истории в памяти в байтах
+    :return: Объем истории в памяти и во временном файле в байтах
+    """
+    scene_objects: mediator.SceneObjects = mediator.SceneObjects((0, 0))
+    scene_objects.states.memory_budget = memory_budget
+    for _ in range(count):
+        scene_objects.rotate((10, 10), 1)
+    return scene_objects.states.memory_size, scene_objects.states.disk_size
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Замер памяти, занимаемой домом и снимками сцены")
+    parser.add_argument("--count", type=int, default=20, help="Количество объектов в каждом замере")
+    parser.add_argument("--operations", type=int, default=1000, help="Количество операций при замере истории отмены")
+    parser.add_argument("--budget", type=int, default=64 * 2 ** 10, help="Объем истории отмены в памяти в байтах")
+    args = parser.parse_args()
+    print(f"Дом: {measure_house(args.count)} байт")
+    print(f"Снимок сцены: {measure_snapshot(args.count)} байт")
+    print(f"Копирование дома: {measure_deepcopy_time(args.count) * 1000:.2f} мс")
+    memory_size, disk_size = measure_history(args.operations, args.budget)
+    print(f"История отмены: {memory_size} байт в памяти, {disk_size} байт на диске")
+
+
+if __name__ == '__main__':
+    main()
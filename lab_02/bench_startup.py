@@ -0,0 +1,70 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+STAGES: dict[str, str] = {
+    "import": """
+import time
+start = time.perf_counter()
+import main
+print(time.perf_counter() - start)
+""",
+    "scene": """
+import time
+import mediator
+start = time.perf_counter()
+mediator.SceneObjects((280, 155))
+print(time.perf_counter() - start)
+""",
+    "first_frame": """
+import time
+start = time.perf_counter()
+import main
+from PyQt6 import QtWidgets
+import interface
+import mediator
+scene_objects = mediator.SceneObjects((280, 155))
+app = QtWidgets.QApplication([])
+window = QtWidgets.QMainWindow()
+ui = interface.Ui_MainWindow(window, scene_objects)
+ui.redraw_scene()
+window.show()
+app.processEvents()
+print(time.perf_counter() - start)
+""",
+}
+
+
+def measure_stage(code: str, repeat: int) -> float:
+    """
+    Медианное время выполнения этапа запуска. Каждый замер выполняется в новом интерпретаторе, чтобы учитывать
+    импорт модулей.
+
+    :param code: Код этапа, печатающий затраченное время в секундах
+    :param repeat: Количество замеров
+    :return: Время в секундах
+    """
+    lab_dir: str = os.path.dirname(os.path.abspath(__file__))
+    env: dict[str, str] = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    times: list[float] = []
+    for _ in range(repeat):
+        res = subprocess.run([sys.executable, "-c", code], cwd=lab_dir, env=env, capture_output=True, text=True,
+                             check=True)
+        times.append(float(res.stdout.split()[-1]))
+    return statistics.median(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Замер времени запуска программы")
+    parser.add_argument("--repeat", type=int, default=5, help="Количество замеров каждого этапа")
+    args = parser.parse_args()
+    print(f"Импорт main: {measure_stage(STAGES['import'], args.repeat) * 1000:.1f} мс")
+    print(f"Создание сцены: {measure_stage(STAGES['scene'], args.repeat) * 1000:.1f} мс")
+    print(f"Первый кадр: {measure_stage(STAGES['first_frame'], args.repeat) * 1000:.1f} мс")
+
+
+if __name__ == '__main__':
+    main()
@@ -9,7 +9,7 @@
 from typing import Type
 
 from PyQt6 import QtCore, QtGui, QtWidgets
-from PyQt6.QtCore import QLineF
+from PyQt6.QtGui import QPainterPath, QPen, QTransform
 from PyQt6.QtWidgets import QMessageBox
 
 import mediator
@@ -20,6 +20,8 @@ class Ui_MainWindow(object):
         self.main_window = MainWindow
         self.setupUi(MainWindow)
         self.scene_objects: mediator.SceneObjects = scene_objects
+        self.object_items: list[QtWidgets.QGraphicsPathItem] = []
+        self.object_lod_levels: tuple[tuple[int, ...], ...] = ()
 
     def setupUi(self, MainWindow):
         MainWindow.setObjectName("MainWindow")
@@ -196,19 +198,55 @@ class Ui_MainWindow(object):
         """
         QMessageBox.critical(self.main_window, title, message)
 
-    def draw_line(self, edge: tuple[tuple[float, float], tuple[float, float]], color: QtGui.QColor) -> None:
-        p1 = edge[0]
-        p2 = edge[1]
-        self.scene.addLine(QLineF(*p1, *p2), color)
+    @staticmethod
+    def lines_path(lines: tuple[tuple[tuple[float, float], tuple[float, float]], ...]) -> QPainterPath:
+        path = QPainterPath()
+        for p1, p2 in lines:
+            path.moveTo(*p1)
+            path.lineTo(*p2)
+        return path
 
-    def redraw_scene(self):
-        self.scene.clear()
-        rendered_objects = self.scene_objects.render()
-        for line in rendered_objects["polygons"]:
-            self.draw_line(line, QtGui.QColor("black"))
+    def update_center_label(self) -> None:
         scene_center: tuple[float, float] = self.scene_objects.scene_center
         self.center_image_label.setText(f"Центр изображения: {scene_center[0]:.1f}, {scene_center[1]:.1f}")
 
+    def redraw_scene(self):
+        """
+        Полная перерисовка сцены по текущим координатам объектов. Каждому объекту сцены соответствует один
+        элемент сцены Qt, который создается при первой отрисовке, а затем только получает новый контур.
+
+        :return: None
+        """
+        rendered_objects = self.scene_objects.render_objects()
+        self.object_lod_levels = self.scene_objects.lod_levels()
+        if len(rendered_objects) != len(self.object_items):
+            for item in self.object_items:
+                self.scene.removeItem(item)
+            pen = QPen(QtGui.QColor("black"))
+            pen.setCosmetic(True)
+            self.object_items = [self.scene.addPath(QPainterPath(), pen) for _ in rendered_objects]
+        for item, rendered in zip(self.object_items, rendered_objects):
+            item.setPath(self.lines_path(rendered["polygons"]))
+            item.resetTransform()
+        self.update_center_label()
+
+    def transform_scene(self, affine: tuple[float, float, float, float, float, float]) -> None:
+        """
+        Отрисовка результата аффинного преобразования сцены. Контуры элементов не перестраиваются, преобразование
+        добавляется к уже накопленному преобразованию каждого элемента. Если после преобразования изменился
+        уровень детализации объектов, сцена перерисовывается полностью.
+
+        :param affine: Примененное к объектам преобразование
+        :return: None
+        """
+        if self.scene_objects.lod_levels() != self.object_lod_levels:
+            self.redraw_scene()
+            return
+        delta = QTransform(*affine)
+        for item in self.object_items:
+            item.setTransform(item.transform() * delta)
+        self.update_center_label()
+
     def move_button_handler(self):
         if not self.validate(float, self.dx_value.text()):
             self.show_error("Ошибка перемещения", "Неверно указана координата x")
@@ -218,8 +256,7 @@ class Ui_MainWindow(object):
             return
         dx: float = float(self.dx_value.text())
         dy: float = float(self.dy_value.text())
-        self.scene_objects.move(dx, dy)
-        self.redraw_scene()
+        self.transform_scene(self.scene_objects.move(dx, dy))
 
     def cancel_button_handler(self):
         if not self.scene_objects.is_prev_state_reachable():
@@ -233,8 +270,7 @@ class Ui_MainWindow(object):
         self.redraw_scene()
 
     def center_button_handler(self):
-        self.scene_objects.move_to_center(self.scene_center)
-        self.redraw_scene()
+        self.transform_scene(self.scene_objects.move_to_center(self.scene_center))
 
     def scale_xy_button_handler(self):
         if not self.validate(float, self.x_scale_value.text()):
@@ -252,8 +288,7 @@ class Ui_MainWindow(object):
         scale_x = float(self.x_scale_value.text())
         scale_y = float(self.y_scale_value.text())
         center = (float(self.center_x_value.text()), float(self.center_y_value.text()))
-        self.scene_objects.scale(center, scale_x, scale_y)
-        self.redraw_scene()
+        self.transform_scene(self.scene_objects.scale(center, scale_x, scale_y))
 
     def scale_center_button_handler(self):
         if not self.validate(float, self.x_scale_value.text()):
@@ -264,8 +299,8 @@ class Ui_MainWindow(object):
             return
         scale_x = float(self.x_scale_value.text())
         scale_y = float(self.y_scale_value.text())
-        self.scene_objects.scale((self.scene_size[0] / 2, self.scene_size[1] / 2), scale_x, scale_y)
-        self.redraw_scene()
+        center: tuple[float, float] = (self.scene_size[0] / 2, self.scene_size[1] / 2)
+        self.transform_scene(self.scene_objects.scale(center, scale_x, scale_y))
 
     def rotate_xy_button_handler(self):
         if not self.validate(float, self.angle_value.text()):
@@ -279,13 +314,11 @@ class Ui_MainWindow(object):
             return
         angle = -float(self.angle_value.text())
         center = (float(self.center_x_value.text()), float(self.center_y_value.text()))
-        self.scene_objects.rotate(center, angle)
-        self.redraw_scene()
+        self.transform_scene(self.scene_objects.rotate(center, angle))
 
     def rotate_center_button_handler(self):
         if not self.validate(float, self.angle_value.text()):
             self.show_error("Ошибка вращения", "Неверно задан угол вращения")
             return
         angle = float(self.angle_value.text())
-        self.scene_objects.rotate((self.scene_size[0] / 2, self.scene_size[1] / 2), angle)
-        self.redraw_scene()
+        self.transform_scene(self.scene_objects.rotate((self.scene_size[0] / 2, self.scene_size[1] / 2), angle))
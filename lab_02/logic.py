@@ -2,11 +2,132 @@ from __future__ import annotations
 
 import copy
 from abc import ABC, abstractmethod
-from math import sin, cos, pi
-from typing import Final, Optional, NewType, override
+from math import sin, cos, pi, floor, ulp
+from typing import TYPE_CHECKING, Final, Iterable, Optional, NewType, override
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+def _slot_names(cls: type) -> tuple[str, ...]:
+    """
+    Имена всех слотов класса с учетом родительских классов.
+
+    :param cls: Класс
+    :return: Кортеж имен слотов
+    """
+    names: list[str] = []
+    for klass in reversed(cls.__mro__):
+        names.extend(klass.__dict__.get("__slots__", ()))
+    return tuple(names)
+
+
+def _deepcopy_slots(obj: object, memodict: Optional[dict]) -> object:
+    """
+    Глубокое копирование объекта с __slots__: копия создается без вызова __init__, затем копируется каждый слот.
+
+    :param obj: Копируемый объект
+    :param memodict: Словарь уже скопированных объектов
+    :return: Копия
+    """
+    if memodict is None:
+        memodict = {}
+    cls = obj.__class__
+    result = cls.__new__(cls)
+    memodict[id(obj)] = result
+    for name in _slot_names(cls):
+        setattr(result, name, copy.deepcopy(getattr(obj, name), memodict))
+    return result
+
+
+Affine = NewType('Affine', tuple[float, float, float, float, float, float])
+"""
+Аффинное преобразование плоскости (m11, m12, m21, m22, dx, dy): x' = m11 * x + m21 * y + dx,
+y' = m12 * x + m22 * y + dy. Порядок коэффициентов совпадает с QTransform.
+"""
+
+
+def translation(x_offset: float, y_offset: float) -> Affine:
+    """
+    Преобразование, соответствующее Point.move.
+    """
+    return Affine((1.0, 0.0, 0.0, 1.0, x_offset, y_offset))
+
+
+def scaling(center: Point, scale_x: float, scale_y: float) -> Affine:
+    """
+    Преобразование, соответствующее Point.scale.
+    """
+    return Affine((scale_x, 0.0, 0.0, scale_y, center.x - center.x * scale_x, center.y - center.y * scale_y))
+
+
+def rotation(center: Point, angle: float) -> Affine:
+    """
+    Преобразование, соответствующее Point.rotate.
+    """
+    cos_a: float = cos(angle)
+    sin_a: float = sin(angle)
+    return Affine((cos_a, -sin_a, sin_a, cos_a, center.x - center.x * cos_a - center.y * sin_a,
+                   center.y + center.x * sin_a - center.y * cos_a))
+
+
+def compose(first: Affine, second: Affine) -> Affine:
+    """
+    Композиция преобразований: сначала first, затем second.
+
+    :param first: Первое преобразование
+    :param second: Второе преобразование
+    :return: Преобразование, равносильное последовательному применению first и second
+    """
+    f11, f12, f21, f22, f_dx, f_dy = first
+    s11, s12, s21, s22, s_dx, s_dy = second
+    return Affine((s11 * f11 + s21 * f12, s12 * f11 + s22 * f12, s11 * f21 + s21 * f22, s12 * f21 + s22 * f22,
+                   s11 * f_dx + s21 * f_dy + s_dx, s12 * f_dx + s22 * f_dy + s_dy))
+
+
+def invert(affine: Affine) -> Affine:
+    """
+    Обратное преобразование.
+
+    :param affine: Преобразование
+    :return: Обратное преобразование
+    :raises ValueError: Если преобразование вырождено
+    """
+    m11, m12, m21, m22, dx, dy = affine
+    det: float = m11 * m22 - m12 * m21
+    if det == 0:
+        raise ValueError
+    i11, i12, i21, i22 = m22 / det, -m12 / det, -m21 / det, m11 / det
+    return Affine((i11, i12, i21, i22, -(i11 * dx + i21 * dy), -(i12 * dx + i22 * dy)))
+
+
+def round_trip_error(affine: Affine, inverse: Affine, extent: float) -> float:
+    """
+    Оценка сверху погрешности, с которой обратное преобразование возвращает на место точки с координатами не больше
+    extent по модулю. Велика для плохо обусловленных преобразований и для сдвигов, много больших координат точек.
+
+    :param affine: Преобразование
+    :param inverse: Обратное преобразование
+    :param extent: Наибольшая по модулю координата точек
+    :return: Оценка погрешности
+    """
+    norm: float = sum(abs(value) for value in affine[:4])
+    inverse_norm: float = sum(abs(value) for value in inverse[:4])
+    shift: float = abs(affine[4]) + abs(affine[5])
+    image: float = norm * extent + shift
+    return 4 * ulp(1.0) * (inverse_norm * (2 * image) + abs(inverse[4]) + abs(inverse[5]))
+
+
+def apply(affine: Affine, x: float, y: float) -> tuple[float, float]:
+    m11, m12, m21, m22, dx, dy = affine
+    return m11 * x + m21 * y + dx, m12 * x + m22 * y + dy
+
+
+IDENTITY: Final[Affine] = translation(0.0, 0.0)
 
 
 class DrawingObject(ABC):
+    __slots__ = ()
     RenderedLine = NewType('RenderedLine', tuple[tuple[float, float], tuple[float, float]])
     RenderedCircle = NewType('RenderedCircle', tuple[float, float, float, float])
 
@@ -28,16 +149,87 @@ class DrawingObject(ABC):
 
 
 class ComplexDrawingObject(DrawingObject):
+    __slots__ = ()
+
     @abstractmethod
     @override
     def render(self) -> dict[str, tuple[DrawingObject.RenderedLine, ...]]:
         pass
 
+    def lod_levels(self) -> tuple[int, ...]:
+        """
+        Уровни детализации составных частей объекта. Отрисовка объекта меняется без преобразования только при смене
+        этих уровней.
+
+        :return: Кортеж уровней детализации
+        """
+        return ()
+
+    @abstractmethod
+    def transform(self, affine: Affine) -> None:
+        pass
+
+    @abstractmethod
+    def extent(self) -> float:
+        """
+        Наибольшая по модулю координата точек объекта.
+
+        :return: Наибольшая по модулю координата
+        """
+        pass
+
+    def snapshot(self) -> ComplexDrawingObject:
+        """
+        Копия объекта для истории состояний. Объекты, которые не изменяются на месте, могут разделять части с копией.
+
+        :return: Копия объекта
+        """
+        return copy.deepcopy(self)
+
     @abstractmethod
     def __deepcopy__(self, memodict={}):
         pass
 
 
+class TransformedObject(DrawingObject):
+    """
+    Объект, преобразования которого накапливаются в матрице аффинного преобразования (строки 3x3 матрицы в
+    однородных координатах без последнего столбца). Перемещение, масштабирование и поворот меняют только матрицу,
+    а координаты вершин вычисляются при отрисовке или при запросе.
+    """
+    __slots__ = ("matrix",)
+
+    def __init__(self):
+        self.matrix: Affine = IDENTITY
+
+    def transform(self, affine: Affine) -> None:
+        """
+        Применение аффинного преобразования к объекту.
+
+        :param affine: Преобразование
+        :return: None
+        """
+        self.matrix = compose(self.matrix, affine)
+
+    def map_point(self, p: Point) -> tuple[float, float]:
+        """
+        Текущие координаты вершины объекта.
+
+        :param p: Вершина в исходном положении
+        :return: Координаты вершины после накопленного преобразования
+        """
+        return apply(self.matrix, p.x, p.y)
+
+    def move(self, x_offset: float, y_offset: float) -> None:
+        self.transform(translation(x_offset, y_offset))
+
+    def scale(self, center: Point, scale_x: float, scale_y: float) -> None:
+        self.transform(scaling(center, scale_x, scale_y))
+
+    def rotate(self, center: Point, angle: float) -> None:
+        self.transform(rotation(center, angle))
+
+
 class Point(DrawingObject):
     """
     Точка. Содержит координаты.
@@ -45,11 +237,21 @@ class Point(DrawingObject):
     :param x: Координата точки
     :param y: Координата точки
     """
+    __slots__ = ("x", "y")
+    eps: Final[float] = 1e-6
 
     def __init__(self, x: float, y: float):
         self.x = x
         self.y = y
 
+    def __deepcopy__(self, memodict=None):
+        result = Point.__new__(Point)
+        result.x = self.x
+        result.y = self.y
+        if memodict is not None:
+            memodict[id(self)] = result
+        return result
+
     def set_pos(self, x: Optional[float], y: Optional[float]):
         if x is None:
             self.y = y
@@ -69,19 +271,7 @@ class Point(DrawingObject):
         :param other: Вторая точка, с которой происходит сравнение
         :return: Результат сравнения
         """
-
-        def is_equal(a: float, b: float) -> bool:
-            """
-            Сравнение двух вещественных чисел. Два вещественных числа равны, если они различаются меньше чем на 1e-6.
-
-            :param a: Первое число
-            :param b: Второе число
-            :return: Результат сравнения
-            """
-            eps: Final[float] = 1e-6
-            return abs(a - b) < eps
-
-        return is_equal(self.x, other.x) and is_equal(self.y, other.y)
+        return abs(self.x - other.x) < Point.eps and abs(self.y - other.y) < Point.eps
 
     def __repr__(self):
         return f"{self.x, self.y}"
@@ -111,6 +301,9 @@ class Point(DrawingObject):
         self.x += x_offset
         self.y += y_offset
 
+    def transform(self, affine: Affine) -> None:
+        self.x, self.y = apply(affine, self.x, self.y)
+
     def scale(self, center: Point, scale_x: float, scale_y: float) -> None:
         cp_x = self.x
         cp_y = self.y
@@ -124,54 +317,109 @@ class Point(DrawingObject):
         self.y = (cp_x - center.x) * -sin(angle) + (cp_y - center.y) * cos(angle) + center.y
 
 
-class Edge(DrawingObject):
+class Edge(TransformedObject):
+    """
+    Отрезок. Концы хранятся в исходном положении, преобразования накапливаются в матрице.
+
+    :param p1: Начало отрезка
+    :param p2: Конец отрезка
+    :raises ValueError: Если концы отрезка совпадают
+    """
+    __slots__ = ("p1", "p2")
 
     def __init__(self, p1: Point, p2: Point):
         if p1 == p2:
             raise ValueError
+        super().__init__()
         self.p1 = p1
         self.p2 = p2
 
+    def __deepcopy__(self, memodict=None):
+        if memodict is None:
+            memodict = {}
+        result = Edge.__new__(Edge)
+        memodict[id(self)] = result
+        result.p1 = copy.deepcopy(self.p1, memodict)
+        result.p2 = copy.deepcopy(self.p2, memodict)
+        result.matrix = self.matrix
+        return result
+
     def __eq__(self, other):
-        return self.p1 == other.p1 and self.p2 == other.p2
+        """
+        Сравнение ребер. Ребра равны, если равны их концы в текущем положении с точностью Point.eps.
+
+        :param other: Второе ребро
+        :return: Результат сравнения
+        """
+        (x1, y1), (x2, y2) = self.render()
+        (other_x1, other_y1), (other_x2, other_y2) = other.render()
+        return (abs(x1 - other_x1) < Point.eps and abs(y1 - other_y1) < Point.eps
+                and abs(x2 - other_x2) < Point.eps and abs(y2 - other_y2) < Point.eps)
 
     def __repr__(self):
-        return f"{self.p1.__repr__(), self.p2.__repr__()}"
+        return f"{self.render()}"
 
     def __str__(self):
-        return f"{self.p1.__str__(), self.p2.__str__()}"
+        return f"{self.render()}"
 
     def center(self) -> Point:
-        return Point((self.p1.x + self.p2.x) / 2, (self.p1.y + self.p2.y) / 2)
+        (x1, y1), (x2, y2) = self.render()
+        return Point((x1 + x2) / 2, (y1 + y2) / 2)
 
     def length(self) -> float:
-        return ((self.p1.x - self.p2.x) ** 2 + (self.p1.y - self.p2.y) ** 2) ** 0.5
+        (x1, y1), (x2, y2) = self.render()
+        return ((x1 - x2) ** 2 + (y1 - y2) ** 2) ** 0.5
 
     def render(self) -> DrawingObject.RenderedLine:
-        return self.RenderedLine((self.p1.render(), self.p2.render()))
-
-    def move(self, dx: float, dy: float):
-        self.p1.move(dx, dy)
-        self.p2.move(dx, dy)
-
-    def scale(self, center: Point, scale_x: float, scale_y: float) -> None:
-        self.p1.scale(center, scale_x, scale_y)
-        self.p2.scale(center, scale_x, scale_y)
+        return self.RenderedLine((self.map_point(self.p1), self.map_point(self.p2)))
 
-    def rotate(self, center: Point, angle: float) -> None:
-        self.p1.rotate(center, angle)
-        self.p2.rotate(center, angle)
 
+class Polygon(TransformedObject):
+    """
+    Многоугольник. При создании проверяется, что смежные ребра не лежат на одной прямой. Ребра хранятся в исходном
+    положении, преобразования многоугольника накапливаются в его матрице.
 
-class Polygon(DrawingObject):
+    :param edges: Ребра многоугольника
+    :param trusted: Пропустить проверку ребер. Используется, когда ребра построены из уже проверенных точек
+    :raises ValueError: Если смежные ребра лежат на одной прямой
+    """
+    __slots__ = ("edges", "points")
 
     @staticmethod
     def is_point_on_the_same_line(x, y, e1):
         return (e1.p2.y - e1.p1.y) * (x - e1.p1.x) == (e1.p2.x - e1.p1.x) * (y - e1.p1.y)
 
-    def __init__(self, edges: tuple[Edge, ...]):
-        for i in range(len(edges) - 1):
-            for k in range(i + 1, len(edges)):
+    _small_size: Final[int] = 8
+
+    @classmethod
+    def _adjacent_edges(cls, edges: tuple[Edge, ...]) -> Iterable[tuple[int, int]]:
+        """
+        Поиск пар ребер, у которых может быть общая вершина. Концы ребер раскладываются по сетке с шагом Point.eps,
+        поэтому равные точки лежат в одной или в соседних ячейках, и поиск занимает O(E) вместо перебора всех пар.
+        Для многоугольников из нескольких ребер перебор всех пар дешевле построения сетки.
+
+        :param edges: Ребра
+        :return: Пары индексов ребер (i, k), i < k
+        """
+        if len(edges) <= cls._small_size:
+            return [(i, k) for i in range(len(edges) - 1) for k in range(i + 1, len(edges))]
+        cells: dict[tuple[int, int], list[int]] = {}
+        for i, edge in enumerate(edges):
+            for p in (edge.p1, edge.p2):
+                cells.setdefault((floor(p.x / Point.eps), floor(p.y / Point.eps)), []).append(i)
+        pairs: set[tuple[int, int]] = set()
+        for (cell_x, cell_y), indices in cells.items():
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    for k in cells.get((cell_x + dx, cell_y + dy), ()):
+                        for i in indices:
+                            if i < k:
+                                pairs.add((i, k))
+        return pairs
+
+    def __init__(self, edges: tuple[Edge, ...], trusted: bool = False):
+        if not trusted:
+            for i, k in self._adjacent_edges(edges):
                 e1: Edge = edges[i]
                 e2: Edge = edges[k]
                 if e1.p1 == e2.p1:
@@ -186,6 +434,7 @@ class Polygon(DrawingObject):
                 elif e1.p2 == e2.p2:
                     if self.is_point_on_the_same_line(e2.p1.x, e2.p1.y, e1):
                         raise ValueError
+        super().__init__()
         self.edges = edges
         self.points: set[Point] = set()
         for edge in self.edges:
@@ -193,78 +442,145 @@ class Polygon(DrawingObject):
             self.points.add(edge.p2)
 
     def render(self) -> tuple[DrawingObject.RenderedLine, ...]:
-        return tuple(edge.render() for edge in self.edges)
+        return tuple(DrawingObject.RenderedLine((self.map_point(edge.p1), self.map_point(edge.p2)))
+                     for edge in self.edges)
 
     def get_points(self) -> tuple[tuple[float, float], ...]:
-        return tuple(el.render() for el in self.points)
+        return tuple(self.map_point(el) for el in self.points)
 
-    def __deepcopy__(self, memodict):
+    def __deepcopy__(self, memodict=None):
+        return _deepcopy_slots(self, memodict)
+
+
+class Triangle(Polygon):
+    __slots__ = ()
+
+    def __init__(self, p1: Point, p2: Point, p3: Point, trusted: bool = False):
+        super().__init__((Edge(p1, p2), Edge(p2, p3), Edge(p1, p3)), trusted)
+
+
+class Ellipse(TransformedObject):
+    """
+    Эллипс. Хранится аналитически: центр и полуоси исходного эллипса и накопленное аффинное преобразование, поэтому
+    перемещение, масштабирование и поворот меняют только матрицу преобразования. Ломаная строится при отрисовке:
+    количество отрезков подбирается по текущему размеру эллипса так, чтобы отклонение ломаной от эллипса не
+    превышало tolerance пикселей. Отрисовки сохраняются для каждого уровня детализации до следующего преобразования.
+
+    :param top_left_p: Левый верхний угол описанного прямоугольника
+    :param width: Ширина эллипса
+    :param height: Высота эллипса
+    """
+    __slots__ = ("center", "semi_axes", "_rendered")
+    tolerance: float = 0.25
+    _min_segments: Final[int] = 16
+    _max_level: Final[int] = 7
+
+    def __init__(self, top_left_p: Point, width: float, height: float) -> None:
+        super().__init__()
+        self.center: Point = Point(top_left_p.x + width / 2, top_left_p.y + height / 2)
+        self.semi_axes: tuple[float, float] = (width / 2, height / 2)
+        self._rendered: dict[int, tuple[DrawingObject.RenderedLine, ...]] = {}
+
+    def __deepcopy__(self, memodict=None):
         if memodict is None:
-            memodict = dict()
-        cls = self.__class__
-        result = cls.__new__(cls)
+            memodict = {}
+        result = Ellipse.__new__(Ellipse)
         memodict[id(self)] = result
-        for k, v in self.__dict__.items():
-            setattr(result, k, copy.deepcopy(v, memodict))
+        result.center = self.center.__deepcopy__(memodict)
+        result.semi_axes = self.semi_axes
+        result.matrix = self.matrix
+        # Отрисовки не изменяются после создания, поэтому копия может их разделять
+        result._rendered = dict(self._rendered)
         return result
 
-    def move(self, x_offset: float, y_offset: float):
-        for p in self.points:
-            p.move(x_offset, y_offset)
+    @override
+    def transform(self, affine: Affine) -> None:
+        super().transform(affine)
+        self._rendered.clear()
 
-    def scale(self, center: Point, scale_x: float, scale_y: float):
-        for p in self.points:
-            p.scale(center, scale_x, scale_y)
+    def conjugate_semi_diameters(self) -> tuple[tuple[float, float], tuple[float, float]]:
+        """
+        Сопряженные полудиаметры эллипса в текущем положении: образы горизонтальной и вертикальной полуосей
+        исходного эллипса.
 
-    def rotate(self, center: Point, angle: float) -> None:
-        for p in self.points:
-            p.rotate(center, angle)
+        :return: Векторы полудиаметров
+        """
+        m11, m12, m21, m22, _, _ = self.matrix
+        a, b = self.semi_axes
+        return (m11 * a, m12 * a), (m21 * b, m22 * b)
 
+    @staticmethod
+    def major_semi_axis(u: tuple[float, float], v: tuple[float, float]) -> float:
+        """
+        Большая полуось эллипса по его сопряженным полудиаметрам.
 
-class Triangle(Polygon):
+        :param u: Первый полудиаметр
+        :param v: Второй полудиаметр
+        :return: Длина большой полуоси
+        """
+        (ux, uy), (vx, vy) = u, v
+        uu: float = ux * ux + uy * uy
+        vv: float = vx * vx + vy * vy
+        uv: float = ux * vx + uy * vy
+        return ((uu + vv + ((uu - vv) ** 2 + 4 * uv * uv) ** 0.5) / 2) ** 0.5
+
+    @classmethod
+    def level_for(cls, radius: float) -> int:
+        """
+        Уровень детализации для эллипса с большой полуосью radius. Ломаная из N отрезков с равномерным шагом
+        параметра отклоняется от такого эллипса не больше чем на radius * (pi / N) ** 2 / 2.
 
-    def __init__(self, p1: Point, p2: Point, p3: Point):
-        super().__init__((Edge(p1, p2), Edge(p2, p3), Edge(p1, p3)))
+        :param radius: Большая полуось
+        :return: Уровень детализации от 0 до _max_level
+        """
+        segments: float = pi * (radius / (2 * cls.tolerance)) ** 0.5
+        level: int = 0
+        while level < cls._max_level and cls.segments_count(level) < segments:
+            level += 1
+        return level
 
+    @classmethod
+    def segments_count(cls, level: int) -> int:
+        return cls._min_segments * 2 ** level
 
-class Ellipse(DrawingObject):
+    def semi_axis(self) -> float:
+        return self.major_semi_axis(*self.conjugate_semi_diameters())
 
-    def __init__(self, top_left_p: Point, width: float, height: float) -> None:
-        self.top_left_p = top_left_p
-        self.points = []
-        step = width / 1000
-        x = -width / 2
-        a_a = width * width / 4
-        b_b = height * height / 4
-        for i in range(1000):
-            self.points.append(
-                Point(x + top_left_p.x + width / 2, (b_b - b_b * x * x / a_a) ** 0.5 + top_left_p.y + height / 2))
-            x += step
-        for i in range(1000):
-            self.points.append(
-                Point(x + top_left_p.x + width / 2, height / 2 + top_left_p.y - ((b_b - b_b * x * x / a_a) ** 0.5)))
-            x -= step
+    def lod_level(self) -> int:
+        return self.level_for(self.semi_axis())
 
-    def render(self) -> tuple[DrawingObject.RenderedLine, ...]:
-        res = []
-        for i in range(len(self.points)):
-            res.append(Edge(self.points[i], self.points[(i + 1) % len(self.points)]).render())
-        return tuple(res)
+    def point_at(self, t: float) -> tuple[float, float]:
+        """
+        Точка эллипса в текущем положении. Параметр 0 соответствует левому концу горизонтальной полуоси исходного
+        эллипса, pi / 2 - нижнему концу вертикальной полуоси.
 
-    def move(self, x_offset: float, y_offset: float) -> None:
-        for p in self.points:
-            p.move(x_offset, y_offset)
+        :param t: Параметр точки
+        :return: Координаты точки
+        """
+        return apply(self.matrix, self.center.x - self.semi_axes[0] * cos(t),
+                     self.center.y + self.semi_axes[1] * sin(t))
 
-    def scale(self, center, scale_x, scale_y) -> None:
-        for p in self.points:
-            p.scale(center, scale_x, scale_y)
+    def render(self, level: Optional[int] = None) -> tuple[DrawingObject.RenderedLine, ...]:
+        """
+        Представление эллипса в виде ломаной из 16 * 2 ** level отрезков.
 
-    def rotate(self, center, angle) -> None:
-        for p in self.points:
-            p.rotate(center, angle)
+        :param level: Уровень детализации, по умолчанию подбирается по текущему размеру эллипса
+        :return: Отрезки ломаной
+        """
+        if level is None:
+            level = self.lod_level()
+        res: Optional[tuple[DrawingObject.RenderedLine, ...]] = self._rendered.get(level)
+        if res is None:
+            segments: int = self.segments_count(level)
+            contour: list[tuple[float, float]] = [self.point_at(2 * pi * i / segments) for i in range(segments)]
+            res = tuple(self.RenderedLine((contour[i - 1], contour[i])) for i in range(1, segments))
+            res += (self.RenderedLine((contour[-1], contour[0])),)
+            self._rendered[level] = res
+        return res
 
 
 class Circle(DrawingObject):
+    __slots__ = ("center", "radius")
 
     def __init__(self, center: Point, radius: float):
         self.center = center
@@ -289,31 +605,90 @@ class Circle(DrawingObject):
         self.radius *= scale_x
 
     def __deepcopy__(self, memodict=None):
-        if memodict is None:
-            memodict = {}
-        cls = self.__class__
-        result = cls.__new__(cls)
-        memodict[id(self)] = result
-        for k, v in self.__dict__.items():
-            setattr(result, k, copy.deepcopy(v, memodict))
-        return result
+        return _deepcopy_slots(self, memodict)
 
 
 class House(ComplexDrawingObject):
+    """
+    Дом. Все вершины дома хранятся в одном массиве vertices формы (N, 2), поэтому перемещение, масштабирование и
+    поворот выполняются одним матричным умножением. Массив вершин доступен только для чтения: преобразование создает
+    новый массив, поэтому копии дома разделяют массив вершин, пока одна из них не будет преобразована. Отрезки
+    многоугольников и отдельные отрезки задаются парами номеров вершин в segments, многоугольники - диапазонами строк
+    segments. Эллипс задается тройкой номеров вершин:
+    центром и концами двух сопряженных полудиаметров, которые при аффинном преобразовании переходят в центр и концы
+    сопряженных полудиаметров преобразованного эллипса.
+
+    :param center: Центр дома
+    """
+    __slots__ = ("vertices", "segments", "ellipses", "_polygons", "_lines", "init_center", "_rendered")
     _initial_width: float = 200
     _initial_height: float = 150
+    _safe_point: Final[int] = 0
 
     def __init__(self, center: Point):
-        self._polygons: list[Polygon] = []
-        self._lines: list[Edge] = []
-        self._ellipses: list[Ellipse] = []
-        self._objects: list[DrawingObject] = []
+        self._rendered: Optional[tuple[tuple[int, ...], dict[str, tuple[DrawingObject.RenderedLine, ...]]]] = None
         self._create_house(center)
 
+    @property
+    def safe_point(self) -> Point:
+        return Point(*self.vertices[self._safe_point].tolist())
+
+    def _pack(self, safe_point: Point, polygons: list[Polygon], lines: list[Edge], ellipses: list[Ellipse]) -> None:
+        """
+        Заполнение массивов вершин и номеров по частям дома.
+
+        :param safe_point: Точка, перемещаемая вместе с домом
+        :param polygons: Многоугольники
+        :param lines: Отрезки
+        :param ellipses: Эллипсы
+        :return: None
+        """
+        # NumPy импортируется при создании первого дома, а не при импорте модуля, чтобы не замедлять запуск
+        import numpy as np
+
+        vertices: list[tuple[float, float]] = []
+        numbers: dict[int, int] = {}
+
+        def number(p: tuple[float, float], key: Optional[int] = None) -> int:
+            if key is not None and key in numbers:
+                return numbers[key]
+            vertices.append(p)
+            if key is not None:
+                numbers[key] = len(vertices) - 1
+            return len(vertices) - 1
+
+        number(safe_point.render())
+        segments: list[tuple[int, int]] = []
+        self._polygons: tuple[slice, ...] = ()
+        for polygon in polygons:
+            first: int = len(segments)
+            segments.extend((number(polygon.map_point(edge.p1), id(edge.p1)),
+                             number(polygon.map_point(edge.p2), id(edge.p2))) for edge in polygon.edges)
+            self._polygons += (slice(first, len(segments)),)
+        first = len(segments)
+        for line in lines:
+            p1, p2 = line.render()
+            segments.append((number(p1), number(p2)))
+        self._lines: slice = slice(first, len(segments))
+        ellipse_vertices: list[tuple[int, int, int]] = []
+        for ellipse in ellipses:
+            (ux, uy), (vx, vy) = ellipse.conjugate_semi_diameters()
+            cx, cy = ellipse.map_point(ellipse.center)
+            ellipse_vertices.append((number((cx, cy)), number((cx + ux, cy + uy)), number((cx + vx, cy + vy))))
+        self.vertices: np.ndarray = np.array(vertices, dtype=np.float64)
+        self.segments: np.ndarray = np.array(segments, dtype=np.intp).reshape(-1, 2)
+        self.ellipses: np.ndarray = np.array(ellipse_vertices, dtype=np.intp).reshape(-1, 3)
+        self.vertices.flags.writeable = False
+        # Номера вершин задают только строение дома и не меняются при преобразованиях
+        self.segments.flags.writeable = False
+        self.ellipses.flags.writeable = False
+
     def _create_house(self, center: Point):
         self.init_center = Point(*center.render())
-        self.safe_point: Point = Point(*center.render())
-        self._objects.append(self.safe_point)
+        safe_point: Point = Point(*center.render())
+        polygons: list[Polygon] = []
+        lines: list[Edge] = []
+        ellipses: list[Ellipse] = []
         initial_point: Point = Point(*center.render())
         initial_point.move(self._initial_width / 2, self._initial_height / 2)
         p1: Point = Point(*initial_point.render())
@@ -327,13 +702,13 @@ class House(ComplexDrawingObject):
         edges: list[Edge] = []
         for i in range(4):
             edges.append(Edge(points[i], points[(i + 1) % 4]))
-        self._polygons.append(Polygon(tuple(edges)))
+        polygons.append(Polygon(tuple(edges), trusted=True))
         initial_point.move(-self._initial_width / 2, -50)
         p5: Point = Point(*initial_point.render())
         edges.clear()
         p6: Point = Point(*p3.render())
         p7: Point = Point(*p4.render())
-        self._polygons.append(Triangle(p5, p6, p7))
+        polygons.append(Triangle(p5, p6, p7, trusted=True))
         initial_point.move(-self._initial_width / 2, 50)
         initial_point.move(self._initial_width / 6, 30)
         center: Point = Point(*initial_point.render())
@@ -348,7 +723,7 @@ class House(ComplexDrawingObject):
         right_point: Point = Point(*initial_point.render())
         initial_point.move(self._initial_width / 2, self._initial_height / 2 - 50)
         initial_point.move(-30, -40)
-        self._ellipses.append(Ellipse(Point(*initial_point.render()), 60, 120))
+        ellipses.append(Ellipse(Point(*initial_point.render()), 60, 120))
         initial_point.move(30, 0)
         rhombus_p1: Point = Point(*initial_point.render())
         initial_point.move(30, 60)
@@ -357,8 +732,8 @@ class House(ComplexDrawingObject):
         rhombus_p3: Point = Point(*initial_point.render())
         initial_point.move(-30, -60)
         rhombus_p4: Point = Point(*initial_point.render())
-        self._polygons.append(Polygon((Edge(rhombus_p1, rhombus_p2), Edge(rhombus_p1, rhombus_p4),
-                                       Edge(rhombus_p2, rhombus_p3), Edge(rhombus_p3, rhombus_p4))))
+        polygons.append(Polygon((Edge(rhombus_p1, rhombus_p2), Edge(rhombus_p1, rhombus_p4),
+                                       Edge(rhombus_p2, rhombus_p3), Edge(rhombus_p3, rhombus_p4)), trusted=True))
         lp1 = Point(*rhombus_p1.render())
         lp2 = Point(*rhombus_p2.render())
         lp3 = Point(*rhombus_p3.render())
@@ -379,49 +754,101 @@ class House(ComplexDrawingObject):
         lp11: Point = Point(*initial_point.render())
         initial_point.move(-30, 0)
         lp12: Point = Point(*initial_point.render())
-        self._polygons.append(Polygon((Edge(lp9, lp10), Edge(lp10, lp11), Edge(lp11, lp12), Edge(lp9, lp12))))
-        self._lines.append(Edge(lp7, lp8))
-        self._lines.append(Edge(lp5, lp6))
-        self._lines.append(Edge(lp1, lp3))
-        self._lines.append(Edge(lp2, lp4))
-        self._lines.append(Edge(up_point, down_point))
-        self._lines.append(Edge(left_point, right_point))
-        self._ellipses.append(Ellipse(center, 40, 40))
-        self._objects.extend(self._polygons)
-        self._objects.extend(self._ellipses)
-        self._objects.extend(self._lines)
+        polygons.append(Polygon((Edge(lp9, lp10), Edge(lp10, lp11), Edge(lp11, lp12), Edge(lp9, lp12)), trusted=True))
+        lines.append(Edge(lp7, lp8))
+        lines.append(Edge(lp5, lp6))
+        lines.append(Edge(lp1, lp3))
+        lines.append(Edge(lp2, lp4))
+        lines.append(Edge(up_point, down_point))
+        lines.append(Edge(left_point, right_point))
+        ellipses.append(Ellipse(center, 40, 40))
+        self._pack(safe_point, polygons, lines, ellipses)
+
+    @override
+    def transform(self, affine: Affine) -> None:
+        """
+        Применение аффинного преобразования ко всем вершинам дома. Массив вершин заменяется новым, а не изменяется
+        на месте, поэтому копии дома, разделяющие прежний массив, не меняются.
+
+        :param affine: Преобразование
+        :return: None
+        """
+        import numpy as np
+
+        m11, m12, m21, m22, dx, dy = affine
+        vertices: np.ndarray = self.vertices @ np.array(((m11, m12), (m21, m22))) + (dx, dy)
+        vertices.flags.writeable = False
+        self.vertices = vertices
+        self._rendered = None
 
     def move(self, x_offset: float, y_offset: float) -> None:
-        for cur_object in self._objects:
-            cur_object.move(x_offset, y_offset)
+        self.transform(translation(x_offset, y_offset))
 
     def scale(self, center: Point, scale_x: float, scale_y: float) -> None:
-        for cur_object in self._objects:
-            cur_object.scale(center, scale_x, scale_y)
+        self.transform(scaling(center, scale_x, scale_y))
 
     def rotate(self, center: Point, angle: float) -> None:
-        for cur_object in self._objects:
-            cur_object.rotate(center, angle)
+        self.transform(rotation(center, angle))
+
+    @override
+    def extent(self) -> float:
+        return float(abs(self.vertices).max(initial=0.0))
+
+    def _ellipse_axes(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        centers: np.ndarray = self.vertices[self.ellipses[:, 0]]
+        return centers, self.vertices[self.ellipses[:, 1]] - centers, self.vertices[self.ellipses[:, 2]] - centers
+
+    @override
+    def lod_levels(self) -> tuple[int, ...]:
+        _, us, vs = self._ellipse_axes()
+        return tuple(Ellipse.level_for(Ellipse.major_semi_axis(u, v)) for u, v in zip(us.tolist(), vs.tolist()))
 
     def render(self) -> dict[str, tuple[DrawingObject.RenderedLine, ...]]:
+        import numpy as np
+
+        levels: tuple[int, ...] = self.lod_levels()
+        if self._rendered is not None and self._rendered[0] == levels:
+            return self._rendered[1]
+        ends: list[list[float]] = self.vertices[self.segments].reshape(-1, 4).tolist()
         rendered_polygons: list[DrawingObject.RenderedLine] = []
-        for cur_object in self._polygons:
-            rendered_polygons.extend(cur_object.render())
-        for cur_object in self._lines:
-            rendered_polygons.append(cur_object.render())
-        for cur_object in self._ellipses:
-            rendered_polygons.extend(cur_object.render())
+        for rows in (*self._polygons, self._lines):
+            rendered_polygons.extend(DrawingObject.RenderedLine(((x1, y1), (x2, y2))) for x1, y1, x2, y2 in ends[rows])
+        for center, u, v, level in zip(*self._ellipse_axes(), levels):
+            t: np.ndarray = np.linspace(0, 2 * pi, Ellipse.segments_count(level), endpoint=False)
+            points: np.ndarray = center - np.outer(np.cos(t), u) + np.outer(np.sin(t), v)
+            contour: list[tuple[float, float]] = [(x, y) for x, y in points.tolist()]
+            rendered_polygons.extend(DrawingObject.RenderedLine((contour[i - 1], contour[i]))
+                                     for i in range(1, len(contour)))
+            rendered_polygons.append(DrawingObject.RenderedLine((contour[-1], contour[0])))
         res: dict[str, tuple[DrawingObject.RenderedLine, ...]] = {
             "polygons": tuple(rendered_polygons),
         }
+        self._rendered = (levels, res)
         return res
 
-    def __deepcopy__(self, memodict={}):
-        cls = self.__class__
-        result = cls.__new__(cls)
-        memodict[id(self)] = result
-        for k, v in self.__dict__.items():
-            setattr(result, k, copy.deepcopy(v, memodict))
+    @override
+    def snapshot(self) -> House:
+        """
+        Копия дома, разделяющая с ним массив вершин и строение. Ни одна из этих частей не изменяется на месте, поэтому
+        создание копии не копирует координаты. Готовая отрисовка в копию не попадает, чтобы не увеличивать снимки
+        истории отмены.
+
+        :return: Копия дома
+        """
+        result = House.__new__(House)
+        result.vertices = self.vertices
+        result.segments = self.segments
+        result.ellipses = self.ellipses
+        result._polygons = self._polygons
+        result._lines = self._lines
+        result.init_center = Point(self.init_center.x, self.init_center.y)
+        result._rendered = None
+        return result
+
+    def __deepcopy__(self, memodict=None):
+        result: House = self.snapshot()
+        if memodict is not None:
+            memodict[id(self)] = result
         return result
 
 
@@ -1,11 +1,13 @@
 import sys
 
-from PyQt6 import QtWidgets
-
-import interface
 import mediator
 
-if __name__ == '__main__':
+
+def main():
+    from PyQt6 import QtWidgets
+
+    import interface
+
     scene_objects = mediator.SceneObjects((280, 155))
     app = QtWidgets.QApplication(sys.argv)
     # app.setFont(QFont("Times", 15))
@@ -14,3 +16,7 @@ if __name__ == '__main__':
     ui.redraw_scene()
     window.show()
     app.exec()
+
+
+if __name__ == '__main__':
+    main()
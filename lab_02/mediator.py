@@ -1,64 +1,310 @@
+from __future__ import annotations
+
 import math
+import os
+import pickle
+import tempfile
+import zlib
+from typing import BinaryIO, Callable, Optional
 
 import logic
-import copy
 
 
 class SceneState:
-    def __init__(self, center: logic.Point, objects: list[logic.ComplexDrawingObject]):
+    """
+    Снимок сцены. Объекты копируются через snapshot, поэтому соседние снимки разделяют неизменяемые части объектов:
+    строение и массивы координат, которые не менялись между снимками.
+
+    :param center: Центр сцены
+    :param objects: Объекты сцены
+    :param copy_objects: Копировать ли объекты. Без копирования снимок использует переданные объекты
+    """
+
+    def __init__(self, center: logic.Point, objects: list[logic.ComplexDrawingObject], copy_objects: bool = True):
         self.scene_center: logic.Point = logic.Point(*center.render())
-        self.objects: list[logic.ComplexDrawingObject] = copy.deepcopy(objects)
+        self.objects: list[logic.ComplexDrawingObject] = (
+            [cur_object.snapshot() for cur_object in objects] if copy_objects else objects)
+
+
+class TransformCommand:
+    """
+    Запись журнала отмены: примененное к сцене преобразование и обратное к нему.
+
+    :param affine: Примененное преобразование
+    :param inverse: Обратное преобразование
+    :param depth: Количество команд после последнего полного снимка, включая эту
+    """
+    __slots__ = ("affine", "inverse", "depth")
+
+    def __init__(self, affine: logic.Affine, inverse: logic.Affine, depth: int):
+        self.affine = affine
+        self.inverse = inverse
+        self.depth = depth
+
+
+# Команды отличаются только числами, поэтому размер одной команды в сериализованном виде измеряется один раз
+_COMMAND_SIZE: int = len(pickle.dumps(TransformCommand(logic.IDENTITY, logic.IDENTITY, 1), pickle.HIGHEST_PROTOCOL))
 
 
 class SceneStatesHolder:
+    """
+    История состояний сцены для отмены операций. Для преобразования сцены хранится только команда с обратным
+    преобразованием, а отмена применяет обратное преобразование к текущей сцене. Чтобы ошибки округления не
+    накапливались, после checkpoint_interval команд подряд вместо команды сохраняется полный снимок сцены. Снимок
+    сохраняется и тогда, когда обратное преобразование не возвращает точки сцены на место с относительной точностью
+    round_trip_eps: для вырожденных и плохо обусловленных преобразований и для сдвигов, много больших координат.
+    Начальное состояние не хранится, а создается функцией zero_state_factory при первом обращении, поэтому запуск
+    программы не требует копирования сцены.
 
-    def __init__(self, zero_state: SceneState):
-        self.zero_state = zero_state
-        self.states: list[SceneState] = [self.zero_state]
+    Объем истории в памяти оценивается по размеру записей в сериализованном виде. Когда он превышает memory_budget,
+    старые записи сжимаются и переносятся блоком во временный файл, а при отмене блок загружается обратно. Записи
+    старше max_depth операций удаляются, и отменить их нельзя. Место удаленных блоков в начале файла освобождается,
+    когда оно превышает объем оставшихся блоков.
+
+    :param zero_state_factory: Функция, создающая новое начальное состояние сцены
+    :param checkpoint_interval: Наибольшее количество команд подряд между полными снимками
+    :param memory_budget: Наибольший объем истории в памяти в байтах
+    :param max_depth: Наибольшее количество хранимых операций, None - без ограничения
+    :param round_trip_eps: Допустимая относительная погрешность отмены одной команды
+    """
+
+    def __init__(self, zero_state_factory: Callable[[], SceneState], checkpoint_interval: int = 32,
+                 memory_budget: int = 16 * 2 ** 20, max_depth: Optional[int] = 10000, round_trip_eps: float = 1e-9):
+        if checkpoint_interval < 1 or memory_budget < 0 or (max_depth is not None and max_depth < 1):
+            raise ValueError
+        self._zero_state_factory: Callable[[], SceneState] = zero_state_factory
+        self._zero_state: Optional[SceneState] = None
+        self.checkpoint_interval = checkpoint_interval
+        self.memory_budget = memory_budget
+        self.max_depth = max_depth
+        self.round_trip_eps = round_trip_eps
+        # Последние записи истории. Если история не пуста, последняя запись всегда находится в памяти
+        self.states: list[SceneState | TransformCommand] = []
+        self._sizes: list[int] = []
+        self.memory_size: int = 0
+        # Блоки записей во временном файле от старых к новым: смещение, длина, количество записей, пропущено записей
+        self._spilled: list[list[int]] = []
+        self._file: Optional[BinaryIO] = None
+        self._dropped: int = 0
+
+    @property
+    def zero_state(self) -> SceneState:
+        if self._zero_state is None:
+            self._zero_state = self._zero_state_factory()
+        return self._zero_state
+
+    @property
+    def disk_size(self) -> int:
+        return os.fstat(self._file.fileno()).st_size if self._file is not None else 0
+
+    @staticmethod
+    def _entry_size(entry: SceneState | TransformCommand) -> int:
+        if isinstance(entry, TransformCommand):
+            return _COMMAND_SIZE
+        return len(pickle.dumps(entry, pickle.HIGHEST_PROTOCOL))
+
+    def __len__(self) -> int:
+        return len(self.states) + sum(count - skipped for _, _, count, skipped in self._spilled)
 
     def is_prev_state_reachable(self):
-        return len(self.states) > 1
+        return len(self.states) > 0
+
+    def get_prev_state(self, current: SceneState) -> SceneState:
+        """
+        Состояние сцены до последней операции.
 
-    def get_prev_state(self) -> SceneState:
-        return self.states.pop()
+        :param current: Текущее состояние сцены. Если последняя операция записана командой, обратное преобразование
+        применяется к объектам этого состояния
+        :return: Предыдущее состояние
+        """
+        entry: SceneState | TransformCommand = self.states.pop()
+        self.memory_size -= self._sizes.pop()
+        if not self.states and self._spilled:
+            self._load()
+        if isinstance(entry, SceneState):
+            return entry
+        if not self.states and not self._dropped:
+            # История всегда начинается с начального состояния, поэтому оно восстанавливается без округлений
+            return self.get_reset_state()
+        current.scene_center.transform(entry.inverse)
+        for cur_object in current.objects:
+            cur_object.transform(entry.inverse)
+        return current
 
     def get_reset_state(self) -> SceneState:
         self.states.clear()
-        self.states.append(self.zero_state)
-        return copy.deepcopy(self.states[0])
+        self._sizes.clear()
+        self.memory_size = 0
+        self._spilled.clear()
+        if self._file is not None:
+            self._file.truncate(0)
+        self._dropped = 0
+        return SceneState(self.zero_state.scene_center, self.zero_state.objects)
 
-    def add_state(self, new_state: SceneState) -> None:
+    def add_state(self, new_state: SceneState | TransformCommand) -> None:
+        size: int = self._entry_size(new_state)
         self.states.append(new_state)
+        self._sizes.append(size)
+        self.memory_size += size
+        if self.max_depth is not None and len(self) > self.max_depth:
+            self._drop_oldest()
+        if self.memory_size > self.memory_budget and len(self.states) > 1:
+            self._spill()
+
+    def add_transform(self, affine: logic.Affine, current: Callable[[], SceneState],
+                      extent: Callable[[], float]) -> None:
+        """
+        Запись преобразования сцены перед его применением.
+
+        :param affine: Преобразование
+        :param current: Функция, создающая снимок текущего состояния сцены, если нужен полный снимок
+        :param extent: Функция, возвращающая наибольшую по модулю координату точек сцены
+        :return: None
+        """
+        depth: int = self.states[-1].depth + 1 if self.states and isinstance(self.states[-1], TransformCommand) else 1
+        if depth <= self.checkpoint_interval:
+            try:
+                inverse: logic.Affine = logic.invert(affine)
+            except ValueError:
+                pass
+            else:
+                scene_extent: float = extent()
+                error: float = logic.round_trip_error(affine, inverse, scene_extent)
+                if error <= self.round_trip_eps * max(1.0, scene_extent):
+                    self.add_state(TransformCommand(affine, inverse, depth))
+                    return
+        self.add_state(current())
+
+    def _spill(self) -> None:
+        """
+        Перенос старых записей во временный файл, пока объем истории в памяти не станет не больше половины
+        memory_budget. Последняя запись остается в памяти.
+
+        :return: None
+        """
+        count: int = 0
+        freed: int = 0
+        while count < len(self.states) - 1 and self.memory_size - freed > self.memory_budget // 2:
+            freed += self._sizes[count]
+            count += 1
+        data: bytes = zlib.compress(pickle.dumps(self.states[:count], pickle.HIGHEST_PROTOCOL))
+        if self._file is None:
+            self._file = tempfile.TemporaryFile()
+        if not self._spilled:
+            self._file.truncate(0)
+        offset: int = self._file.seek(0, 2)
+        self._file.write(data)
+        self._spilled.append([offset, len(data), count, 0])
+        del self.states[:count]
+        del self._sizes[:count]
+        self.memory_size -= freed
+
+    def _load(self) -> None:
+        """
+        Загрузка последнего перенесенного в файл блока записей. Файл укорачивается до начала блока, а после загрузки
+        последнего блока - до нуля, вместе с местом удаленных блоков.
+
+        :return: None
+        """
+        offset, length, _, skipped = self._spilled.pop()
+        self._file.seek(offset)
+        entries: list[SceneState | TransformCommand] = pickle.loads(zlib.decompress(self._file.read(length)))
+        self._file.truncate(offset if self._spilled else 0)
+        self.states = entries[skipped:] + self.states
+        self._sizes = [self._entry_size(entry) for entry in entries[skipped:]] + self._sizes
+        self.memory_size = sum(self._sizes)
+
+    def _drop_oldest(self) -> None:
+        """
+        Удаление самой старой записи истории. Записи в файле удаляются без перезаписи файла: блок запоминает
+        количество удаленных записей и исключается из истории, когда удалены все его записи. Если место исключенных
+        блоков в начале файла превышает объем оставшихся, оставшиеся блоки переносятся в начало файла.
+
+        :return: None
+        """
+        self._dropped += 1
+        if not self._spilled:
+            self.states.pop(0)
+            self.memory_size -= self._sizes.pop(0)
+            return
+        block: list[int] = self._spilled[0]
+        block[3] += 1
+        if block[3] < block[2]:
+            return
+        self._spilled.pop(0)
+        if not self._spilled:
+            self._file.truncate(0)
+            return
+        start: int = self._spilled[0][0]
+        if start <= self.disk_size - start:
+            return
+        self._file.seek(start)
+        data: bytes = self._file.read()
+        self._file.seek(0)
+        self._file.write(data)
+        self._file.truncate(len(data))
+        for block in self._spilled:
+            block[0] -= start
 
 
 class SceneObjects:
     def __init__(self, scene_center: tuple[float, float]):
         self._scene_center: logic.Point = logic.Point(*scene_center)
         self.objects: list[logic.ComplexDrawingObject] = [logic.House(logic.Point(*scene_center))]
-        self.states: SceneStatesHolder = SceneStatesHolder(SceneState(self._scene_center, self.objects))
+        self.states: SceneStatesHolder = SceneStatesHolder(
+            lambda: SceneState(logic.Point(*scene_center), [logic.House(logic.Point(*scene_center))], False))
 
     @property
     def scene_center(self) -> tuple[float, float]:
         return self._scene_center.render()
 
-    def move(self, x_offset: float, y_offset: float):
-        self.states.add_state(SceneState(self._scene_center, self.objects))
-        self._scene_center.move(x_offset, y_offset)
-        for cur_object in self.objects:
-            cur_object.move(x_offset, y_offset)
+    def transform(self, affine: logic.Affine) -> logic.Affine:
+        """
+        Аффинное преобразование сцены с записью в историю для отмены.
 
-    def scale(self, center: tuple[float, float], scale_x: float, scale_y: float):
-        self.states.add_state(SceneState(self._scene_center, self.objects))
-        self._scene_center.scale(logic.Point(*center), scale_x, scale_y)
+        :param affine: Преобразование
+        :return: Примененное преобразование
+        """
+        self.states.add_transform(affine, lambda: SceneState(self._scene_center, self.objects), self.extent)
+        self._scene_center.transform(affine)
         for cur_object in self.objects:
-            cur_object.scale(logic.Point(*center), scale_x, scale_y)
+            cur_object.transform(affine)
+        return affine
 
-    def rotate(self, center: tuple[float, float], angle: float):
-        angle = angle / 180 * math.pi
-        self.states.add_state(SceneState(self._scene_center, self.objects))
-        self._scene_center.rotate(logic.Point(*center), angle)
-        for cur_object in self.objects:
-            cur_object.rotate(logic.Point(*center), angle)
+    def extent(self) -> float:
+        return max([abs(self._scene_center.x), abs(self._scene_center.y)]
+                   + [cur_object.extent() for cur_object in self.objects])
+
+    def move(self, x_offset: float, y_offset: float) -> logic.Affine:
+        """
+        Перемещение сцены.
+
+        :param x_offset: Смещение по x
+        :param y_offset: Смещение по y
+        :return: Примененное преобразование
+        """
+        return self.transform(logic.translation(x_offset, y_offset))
+
+    def scale(self, center: tuple[float, float], scale_x: float, scale_y: float) -> logic.Affine:
+        """
+        Масштабирование сцены.
+
+        :param center: Центр масштабирования
+        :param scale_x: Коэффициент масштабирования по x
+        :param scale_y: Коэффициент масштабирования по y
+        :return: Примененное преобразование
+        """
+        return self.transform(logic.scaling(logic.Point(*center), scale_x, scale_y))
+
+    def rotate(self, center: tuple[float, float], angle: float) -> logic.Affine:
+        """
+        Поворот сцены.
+
+        :param center: Центр поворота
+        :param angle: Угол поворота в градусах
+        :return: Примененное преобразование
+        """
+        return self.transform(logic.rotation(logic.Point(*center), angle / 180 * math.pi))
 
     def render(self) -> ...:
         rendered_objects = {"polygons": []}
@@ -67,10 +313,16 @@ class SceneObjects:
             rendered_objects["polygons"].extend(cur_render["polygons"])
         return rendered_objects
 
-    def move_to_center(self, screen_center: tuple[float, float]):
+    def lod_levels(self) -> tuple[tuple[int, ...], ...]:
+        return tuple(cur_object.lod_levels() for cur_object in self.objects)
+
+    def render_objects(self) -> list[dict[str, tuple[logic.DrawingObject.RenderedLine, ...]]]:
+        return [cur_object.render() for cur_object in self.objects]
+
+    def move_to_center(self, screen_center: tuple[float, float]) -> logic.Affine:
         x_offset: float = self.scene_center[0] - screen_center[0]
         y_offset: float = self.scene_center[1] - screen_center[1]
-        self.move(x_offset, y_offset)
+        return self.move(x_offset, y_offset)
 
     def get_scene_center(self) -> tuple[float, float]:
         return self.scene_center
@@ -79,7 +331,7 @@ class SceneObjects:
         return self.states.is_prev_state_reachable()
 
     def get_prev_state(self) -> None:
-        new_state = self.states.get_prev_state()
+        new_state = self.states.get_prev_state(SceneState(self._scene_center, self.objects, False))
         self.objects = new_state.objects
         self._scene_center = new_state.scene_center
 